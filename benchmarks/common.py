@@ -0,0 +1,62 @@
+"""
+Scaffolding shared by the benchmark scripts.
+
+The scripts only call API that predates the change they measure, so compare.py can run the same script
+against the commit before that change and against the working tree.
+"""
+
+import contextlib
+import time
+import timeit
+
+from manim import Scene
+
+
+@contextlib.contextmanager
+def benchmark_scene():
+    # trees from before SceneManager.activate() have a process-wide scene manager, attached by Scene()
+    scene = Scene()
+    activate = getattr(scene.scene_manager, "activate", None)
+    if activate is None:
+        yield scene
+    else:
+        with activate():
+            yield scene
+
+
+def row(label: str, value: str, unit: str = ""):
+    print(f"{label:<32} {value:>12} {unit}".rstrip())
+
+
+def timed(label: str, fn, number: int = 10, repeat: int = 5):
+
+    """
+    Prints the best time per call over repeat runs of number calls each.
+    A RecursionError is reported in place of the time, trees from before the iterative traversals raise it on deep graphs.
+    """
+
+    try:
+        seconds = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+    except RecursionError:
+        row(label, "RecursionError")
+        return
+    row(label, f"{seconds * 1000:.2f}", "ms")
+
+
+def timed_once(label: str, fn):
+
+    """ Runs fn once, prints how long it took and returns its result, or None after a RecursionError. """
+
+    start = time.perf_counter()
+    try:
+        result = fn()
+    except RecursionError:
+        row(label, "RecursionError")
+        return None
+    row(label, f"{(time.perf_counter() - start) * 1000:.2f}", "ms")
+    return result
+
+
+def per_second(label: str, fn, number: int, repeat: int = 5):
+    rate = number / min(timeit.repeat(fn, number=number, repeat=repeat))
+    row(label, f"{rate:.0f}", "/ s")
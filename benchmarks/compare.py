@@ -0,0 +1,60 @@
+"""
+Runs benchmark scripts against an older commit, then against this checkout.
+
+    python benchmarks/compare.py <commit> [benchmarks/<script>.py ...]
+
+The commit is checked out into a temporary git worktree, and each script runs twice,
+with PYTHONPATH pointing at the worktree (before) and at this checkout (after).
+The scripts always come from this checkout. With no scripts given, every benchmark runs.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+BENCHMARKS = Path(__file__).resolve().parent
+ROOT = BENCHMARKS.parent
+
+
+def benchmark_scripts():
+    return sorted(path for path in BENCHMARKS.glob("*.py") if path.name not in ("common.py", "compare.py"))
+
+
+def run(script: Path, tree: Path, cwd: str) -> str:
+    # cwd is a scratch directory, so manim's media/ output stays out of both trees
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ str(tree), str(BENCHMARKS) ]))
+    result = subprocess.run([ sys.executable, str(script) ], env=env, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        return result.stdout + f"exited with {result.returncode}\n" + "\n".join(result.stderr.splitlines()[-5:]) + "\n"
+    return result.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run benchmarks before and after a commit range.")
+    parser.add_argument("commit", help="the tree to measure as 'before', e.g. the parent of the commit under test")
+    parser.add_argument("scripts", nargs="*", type=Path)
+    args = parser.parse_args()
+
+    scripts = [ script.resolve() for script in args.scripts ] or benchmark_scripts()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        worktree = Path(scratch) / "before"
+        subprocess.run([ "git", "-C", str(ROOT), "worktree", "add", "--detach", str(worktree), args.commit ], check=True, capture_output=True)
+        try:
+            for script in scripts:
+                print(f"== {script.name}")
+                print(f"-- before ({args.commit})")
+                print(run(script, worktree, scratch), end="")
+                print("-- after (working tree)")
+                print(run(script, ROOT, scratch), end="")
+                print()
+        finally:
+            subprocess.run([ "git", "-C", str(ROOT), "worktree", "remove", "--force", str(worktree) ], check=True, capture_output=True)
+
+
+if __name__ == "__main__":
+    main()
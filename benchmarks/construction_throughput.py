@@ -0,0 +1,28 @@
+"""
+DynamicMobject construction throughput.
+
+Before the construction fast path, every DynamicMobject built two throwaway VMobject()s
+(one for position_factor, one for MobjectIdentity.mobject_center). Before / after:
+
+    python benchmarks/compare.py f243407^ benchmarks/construction_throughput.py
+"""
+
+from common import benchmark_scene, per_second
+from reactive_manim import *
+
+
+NUMBER = 2000
+
+
+def main():
+    with benchmark_scene():
+
+        # the first MathTex("x") renders, the timed ones come from the render cache
+        MathTex("x")
+
+        per_second("DGroup()", DGroup, number=NUMBER)
+        per_second("MathTex(\"x\")", lambda: MathTex("x"), number=NUMBER // 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+DynamicMobject.copy() and graph snapshots on a 500-node expression.
+
+Times the copy paths, then checks that the memory retained by progress snapshots stays flat as progress points are saved.
+Before / after the bulk-buffer copy path:
+
+    python benchmarks/compare.py c053e93^ benchmarks/copy_500_nodes.py
+"""
+
+import numpy as np
+from common import benchmark_scene, row, timed
+from reactive_manim import *
+
+
+NODES = 500
+PROGRESS_POINTS = 50
+
+# the numpy buffers of a VMobject
+BUFFER_ATTRIBUTES = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas")
+
+
+def build_expression(nodes: int) -> MathTex:
+    # Term("x", i) is a Term with two MathString children, three nodes per term
+    return MathTex(*[ Term("x", i) for i in range(nodes // 3) ])
+
+
+def retained_nbytes(graph: DynamicMobjectGraph) -> int:
+    # a view keeps its whole base array alive, so count each base once
+    bases = {}
+    for root_mobject in graph.root_mobjects:
+        for mobject in root_mobject.current_dynamic_mobject.get_family():
+            for key in BUFFER_ATTRIBUTES:
+                buffer = mobject.__dict__.get(key)
+                if isinstance(buffer, np.ndarray):
+                    base = buffer if buffer.base is None else buffer.base
+                    bases[id(base)] = base.nbytes
+    return sum(bases.values())
+
+
+def main():
+    with benchmark_scene():
+
+        tex = build_expression(NODES)
+        print(f"{len(tex.graph.mobjects)} nodes")
+
+        timed("mobject.copy()", tex.copy)
+        timed("graph.copy()", tex.graph.copy)
+
+        manager = tex.graph.manager()
+        manager.save_source_graph()
+        row("snapshot bytes, 1 point", str(retained_nbytes(manager.progress_manager.source_graph)))
+
+        for i in range(PROGRESS_POINTS):
+            tex[i % len(tex)] = Term("y", i)
+            manager.save_source_graph()
+
+        row(f"snapshot bytes, {PROGRESS_POINTS + 1} points", str(retained_nbytes(manager.progress_manager.source_graph)))
+
+
+if __name__ == "__main__":
+    main()
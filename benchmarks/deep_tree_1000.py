@@ -0,0 +1,47 @@
+"""
+Graph operations on a tree 1000 levels deep.
+
+Nests DGroups, so no LaTeX is rendered and only the traversals are timed.
+Every operation here walks the full depth, and runs under the default recursion limit:
+the library's traversals and DynamicMobject.get_family() (used by move_to() / shift() on every compose) are iterative.
+Before / after the iterative traversals, where the before tree reports RecursionError:
+
+    python benchmarks/compare.py 8bafed2^ benchmarks/deep_tree_1000.py
+"""
+
+from common import benchmark_scene, timed_once
+from manim import Dot
+from reactive_manim import *
+
+
+DEPTH = 1000
+
+
+def build_tree(depth: int) -> DGroup:
+    group = DGroup(Dot())
+    for _ in range(depth - 1):
+        group = DGroup(group)
+    return group
+
+
+def main():
+    with benchmark_scene():
+
+        root = timed_once(f"build {DEPTH} levels", lambda: build_tree(DEPTH))
+        if root is None:
+            return
+
+        leaf = root
+        while leaf.mobjects and isinstance(leaf.mobjects[0], DGroup):
+            leaf = leaf.mobjects[0]
+        print(f"leaf depth {leaf.identity.depth()}")
+
+        timed_once("traverse_mobjects()", root.graph.traverse_mobjects)
+        timed_once("get_dynamic_family()", root.get_dynamic_family)
+        timed_once("get_family()", root.get_family)
+        timed_once("connected_from_root()", lambda: DynamicMobjectGraph.connected_from_root(root.identity))
+        timed_once("leaf edit (recompose chain)", lambda: leaf.add(Dot()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+GraphTransformDescriptor construction for a 1000-node graph.
+
+The source and target graphs are snapshots of a flat DGroup graph, before and after replacing a tenth of its children,
+so the descriptor resolves transformers, removers and introducers. Before / after indexing source ids in the skeleton:
+
+    python benchmarks/compare.py d410def^ benchmarks/descriptor_1000_nodes.py
+"""
+
+from common import benchmark_scene, timed
+from reactive_manim import *
+
+
+NODES = 1000
+
+
+def main():
+    with benchmark_scene():
+
+        root = DGroup(*[ DGroup() for _ in range(NODES - 1) ])
+        source_graph = root.graph.copy()
+
+        children = list(root.mobjects)
+        for i in range(0, len(children), 10):
+            children[i] = DGroup()
+        root.mobjects = children
+        target_graph = root.graph.copy()
+
+        print(f"{len(source_graph.mobjects)} source nodes, {len(target_graph.mobjects)} target nodes")
+
+        timed("GraphTransformDescriptor()", lambda: GraphTransformDescriptor(source_graph, target_graph))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Per-node memory of a 1000-node graph.
+
+Reports the traced allocation per node for building the graph, and the size of one MobjectIdentity including its instance __dict__, if it has one.
+Before / after slotting MobjectIdentity, where the before tree is the real dict-backed class:
+
+    python benchmarks/compare.py cd18ba3^ benchmarks/node_memory_1000.py
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from common import benchmark_scene, row
+from reactive_manim import *
+
+
+NODES = 1000
+
+
+def identity_nbytes(identity: MobjectIdentity) -> int:
+    instance_dict = getattr(identity, "__dict__", None)
+    return sys.getsizeof(identity) + (sys.getsizeof(instance_dict) if instance_dict is not None else 0)
+
+
+def main():
+    with benchmark_scene():
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+
+        root = DGroup(*[ DGroup() for _ in range(NODES - 1) ])
+
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        identities = root.graph.mobjects
+        print(f"{len(identities)} nodes")
+        row("traced bytes per node", f"{(after - before) / len(identities):.1f}", "B")
+        row("MobjectIdentity", f"{sum(identity_nbytes(identity) for identity in identities) / len(identities):.1f}", "B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Child registration for a MathTex of 300 terms, each holding a subtree.
+
+Recomposes the MathTex with an unchanged tex string, so the render comes from the cache and registration dominates.
+Before / after the next_family lookup in conditional_clone():
+
+    python benchmarks/compare.py cd0bacf^ benchmarks/register_300_terms.py
+"""
+
+from common import benchmark_scene, timed
+from reactive_manim import *
+
+
+TERMS = 300
+
+
+def recompose(mobject: DynamicMobject):
+    mobject.begin_edit()
+    mobject.end_edit()
+
+
+def main():
+    with benchmark_scene():
+
+        tex = MathTex(*[ Term("x", i) for i in range(TERMS) ])
+        print(f"{len(tex)} terms, {len(tex.graph.mobjects)} nodes")
+
+        timed("recompose", lambda: recompose(tex), number=5)
+
+
+if __name__ == "__main__":
+    main()
@@ -64,6 +64,10 @@ class ProgressTransformManager(AbstractDynamicTransformManager):
 
         super().begin_transforms()
 
+    def descriptor_graphs(self) -> Tuple[DynamicMobjectGraph, DynamicMobjectGraph]:
+        # the progress snapshots are already private copies, replaced (not mutated) by the next save_source_graph(), so they are not copied again
+        return (self.source_graph, self.target_graph)
+
     def observers(self) -> List[DynamicMobject]:
 
         # Consider tex = MathTex(a, b, c); scene.add(tex); tex.terms = [ b, c, d ]; scene.play(TransformInStages.progress(tex))
@@ -180,9 +184,8 @@ class AbstractDynamicTransform(Animation):
         config = None,
         **kwargs
     ):
-        scene_manager = SceneManager.scene_manager()
         subgraph = cls.extract_subgraph(mobject)
-        primary = { mobject.graph for mobject in subgraph.mobjects if scene_manager.graph_manager(mobject.graph).has_progress_manager() }
+        primary = { mobject.graph for mobject in subgraph.mobjects if mobject.graph.manager().has_progress_manager() }
 
         if len(primary) > 1:
             raise Exception("Cannot progress selection of multiple DynamicMobjectGraph(s)")
@@ -191,7 +194,7 @@ class AbstractDynamicTransform(Animation):
             raise Exception("DynamicMobjectGraph does not have progress-point, missing scene.add(mobject) or scene.play(Introducer(mobject))")
         
         graph = extract_unique(primary)
-        graph_manager = scene_manager.graph_manager(graph)
+        graph_manager = graph.manager()
         progress_manager = graph_manager.progress_manager
 
         transform_manager = graph_manager.accept_transform_manager(
@@ -203,16 +206,14 @@ class AbstractDynamicTransform(Animation):
         for mobject in subgraph.mobjects:
             participants.add(mobject.id)
         
-        for mobject in subgraph.mobjects:
-            for descendant in transform_manager.mobject_union.values():
-                if transform_manager.transform_descriptor.is_continuous_ancestor(mobject.id, descendant.id):
-                    if transform_manager.transform_descriptor.is_scene_remover(descendant.id):
-                        participants.add(descendant.id)
-                    else:
-                        #if transform_manager.transform_descriptor.is_target_ancestor(mobject.id, descendant.id):
-                        #    continue
+        # only scene-removers below a selected mobject join the participants, so those are filtered once before the ancestry tests
+        transform_descriptor = transform_manager.transform_descriptor
+        scene_removers = [ descendant for descendant in transform_manager.mobject_union.values() if transform_descriptor.is_scene_remover(descendant.id) ]
 
-                        continue
+        for mobject in subgraph.mobjects:
+            for descendant in scene_removers:
+                if transform_descriptor.is_continuous_ancestor(mobject.id, descendant.id):
+                    participants.add(descendant.id)
 
         animation = cls(transform_manager, participants, param=config, **kwargs)
 
@@ -242,9 +243,7 @@ class AbstractDynamicTransform(Animation):
         target_graph = cls.extract_graph(target_subgraph)
 
 
-        scene_manager = SceneManager.scene_manager()
-
-        transform_manager = scene_manager.graph_manager(target_graph).accept_transform_manager(
+        transform_manager = target_graph.manager().accept_transform_manager(
             ReplacementTransformManager(source_graph, target_graph).set_abstract_dynamic_transform(cls) # discarded on subsequent partial-transforms
         )
 
@@ -281,9 +280,7 @@ class AbstractDynamicTransform(Animation):
         source_graph = cls.extract_graph(source_subgraph)
         target_graph = cls.extract_graph(target_subgraph)
 
-        scene_manager = SceneManager.scene_manager()
-
-        transform_manager = scene_manager.graph_manager(target_graph).accept_transform_manager(
+        transform_manager = target_graph.manager().accept_transform_manager(
             FromCopyTransformManager(source_graph, target_graph).set_abstract_dynamic_transform(cls)
         )
 
@@ -490,12 +487,16 @@ class ExtractTransform(Animation):
     def begin(self):
         self.animation.begin()
 
+        # the container holds the animated mobject itself, which the inner animation updates in place every frame
+        # so there is nothing to copy into the container per frame, unlike container.become(animation.mobject.copy())
+        self.container.points = empty_points
+        self.container.submobjects = [ self.animation.mobject ]
+
     def finish(self):
         self.animation.finish()
 
     def interpolate(self, alpha: float) -> None:
         self.animation.interpolate(alpha)
-        self.container.become(self.animation.mobject.copy())
 
     def get_run_time(self) -> float:
         return self.animation.get_run_time()
@@ -503,6 +504,8 @@ class ExtractTransform(Animation):
 
 class DynamicMobjectTransformItinerary():
 
+    __slots__ = ("config", "id", "source_mobject", "target_mobject", "animation_generator", "track")
+
     def __init__(
         self,
         config: DynamicTransformConfiguration,
@@ -511,16 +514,19 @@ class DynamicMobjectTransformItinerary():
         self.config = config
         self.id = id
 
-        self.source_mobject: VMobject = VMobject()
-        self.target_mobject: VMobject = VMobject()
         self.animation_generator: Callable[[Mobject, Mobject], Animation] = lambda source, target: Transform(source, target)
         self.track = AnimationTrack(config, parent_track=self.config.root_track, run_time=1, is_leaf_track=True, name=self.id, id=self.id)
 
+        # build() copies both ends, so a missing end can share the empty placeholder
         if self.config.transform_descriptor.has_source(self.id):
-            self.source_mobject = self.config.transform_descriptor.find_source_dynamic_mobject(self.id).direct_submobjects().copy()
+            self.source_mobject: VMobject = self.config.transform_descriptor.find_source_dynamic_mobject(self.id).direct_submobjects().copy()
+        else:
+            self.source_mobject: VMobject = empty_vmobject()
 
         if self.config.transform_descriptor.has_target(self.id):
-            self.target_mobject = self.config.transform_descriptor.find_target_dynamic_mobject(self.id).direct_submobjects().copy()
+            self.target_mobject: VMobject = self.config.transform_descriptor.find_target_dynamic_mobject(self.id).direct_submobjects().copy()
+        else:
+            self.target_mobject: VMobject = empty_vmobject()
             
     def set_animation_generator(self, animation_generator):
         self.animation_generator = animation_generator
@@ -604,6 +610,8 @@ class ItinerarySelectionInterceptor():
     
 
 class AnimationTrack():
+
+    __slots__ = ("run_time", "require_points", "config", "is_root_track", "is_leaf_track", "id", "children", "parent_track", "name", "start_time")
     
     def set_run_time(self):
         if self.is_leaf_track and self.parent_track is not None:
@@ -6,7 +6,14 @@ import copy
 import numpy as np
 from .helpers import *
 from manim import *
+from contextlib import contextmanager
+from contextvars import ContextVar
 import functools
+import gc
+import heapq
+import itertools
+import threading
+import weakref
 
 
 _breakpoint = [False]
@@ -37,7 +44,7 @@ def intercept_animation_init(self, *args, **kwargs):
 
         for mobject in dynamic_mobjects:
             for dm in mobject.get_dynamic_family():
-                SceneManager.scene_manager().construct_remover_animation(dm)
+                dm.graph.scene_manager.construct_remover_animation(dm)
 
     if self.introducer:
 
@@ -45,7 +52,7 @@ def intercept_animation_init(self, *args, **kwargs):
 
         for mobject in dynamic_mobjects:
             for dm in mobject.get_dynamic_family():
-                SceneManager.scene_manager().construct_introducer_animation(dm)
+                dm.graph.scene_manager.construct_introducer_animation(dm)
 
 Animation.__init__ = intercept_animation_init
 
@@ -58,8 +65,8 @@ def attach_progress_interceptors(scene: Scene) -> SceneManager:
     
     scene_manager = attach_progress_interceptors_function(scene)
 
+    # not made current here, render() and SceneManager.activate() set current_scene_manager for as long as they run
     scene.scene_manager = scene_manager
-    SceneManager._scene_manager = scene_manager
 
     return scene_manager
 
@@ -110,9 +117,17 @@ def attach_progress_interceptors_function(scene: Scene) -> SceneManager:
 
             return scene
 
+        scene_render = scene.render
+
+        def _render(*args, **kwargs):
+            # construct() runs inside render(), so everything built there resolves to this scene, whichever thread or task renders it
+            with scene_manager.activate():
+                return scene_render(*args, **kwargs)
+
         scene.add = _add
         scene.wait = _wait
         scene.remove = _remove
+        scene.render = _render
 
         scene.scene_add = scene_add
         scene.scene_wait = scene_wait
@@ -123,26 +138,144 @@ def attach_progress_interceptors_function(scene: Scene) -> SceneManager:
 def extract_direct_dynamic_mobjects(mobject: Mobject):
     dynamic_mobjects: Set[DynamicMobject] = set()
 
-    def recursive_extract(mobject):
-        for submobject in mobject.submobjects:
+    if isinstance(mobject, DynamicMobject):
+        return [ mobject ]
+    
+    stack = [ mobject ]
+    while stack:
+        for submobject in stack.pop().submobjects:
             if isinstance(submobject, DynamicMobject):
                 dynamic_mobjects.add(submobject)
             else:
-                recursive_extract(submobject)
+                stack.append(submobject)
 
-    if isinstance(mobject, DynamicMobject):
-        return [ mobject ]
-    else:
-        recursive_extract(mobject)
-        return list(dynamic_mobjects)
+    return list(dynamic_mobjects)
     
 
-graph_references = []
-graph_references_memo = {}
+# the scene manager that new graphs register with, set by SceneManager.activate() (which the patched scene.render() enters)
+current_scene_manager: ContextVar[SceneManager | None] = ContextVar("current_scene_manager", default=None)
+
+# weak, so graphs are collected once no mobject refers to them
+graph_references: weakref.WeakSet[DynamicMobjectGraph] = weakref.WeakSet()
+graph_references_memo: weakref.WeakKeyDictionary[MobjectIdentity, weakref.ref[DynamicMobjectGraph]] = weakref.WeakKeyDictionary()
+
+
+mobject_buffer_attributes = ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas")
+
+# shared placeholders, so constructors don't run VMobject's config/color setup for a zero-size points array or the origin
+# they are only ever replaced, never modified in place
+empty_points: np.ndarray = np.zeros((0, 3))
+_empty_vmobject: VMobject | None = None
+
+def empty_vmobject() -> VMobject:
+    """ Shared empty VMobject, created on first use so manim's config is read at render time rather than import time. Copy before editing. """
+    global _empty_vmobject
+    if _empty_vmobject is None:
+        _empty_vmobject = VMobject()
+    return _empty_vmobject
+
+def seed_bulk_buffers(mobjects: List[Mobject], memo):
+
+    """
+    Copies the numpy buffers of every mobject in the families of mobjects into one allocation per dtype, 
+    and seeds memo with views into it, so the deepcopy that follows takes those views instead of allocating each buffer on its own.
+    Buffers already in memo are left alone.
+    """
+
+    buffers: Dict[np.dtype, List[np.ndarray]] = {}
+    seen: Set[int] = set()
+
+    for mobject in mobjects:
+        for submobject in mobject.get_family():
+            for key in mobject_buffer_attributes:
+                buffer = submobject.__dict__.get(key)
+                if isinstance(buffer, np.ndarray) and id(buffer) not in memo and id(buffer) not in seen:
+                    seen.add(id(buffer))
+                    buffers.setdefault(buffer.dtype, []).append(buffer)
+
+    for (dtype, dtype_buffers) in buffers.items():
+        if len(dtype_buffers) < 2:
+            continue
+
+        bulk = np.concatenate([ buffer.ravel() for buffer in dtype_buffers ])
+        offset = 0
+        for buffer in dtype_buffers:
+            memo[id(buffer)] = bulk[offset:offset + buffer.size].reshape(buffer.shape)
+            offset += buffer.size
+
+
+def direct_family(mobject: Mobject) -> List[Mobject]:
+    # stops at dynamic mobjects, those are matched through their own identity
+    return preorder(mobject, lambda m: [ submobject for submobject in m.submobjects if not isinstance(submobject, DynamicMobject) ])
+
+def share_equal_buffers(mobject: DynamicMobject, shared_mobject: DynamicMobject, memo):
+
+    """
+    Seeds memo, so a deepcopy of mobject takes the buffers of shared_mobject (its copy in an earlier snapshot) wherever they are still equal, instead of copying them.
+    Buffers are compared by content, rotate(), updaters, .animate and direct edits to glyphs change them without a compose.
+    """
+
+    family = direct_family(mobject)
+    shared_family = direct_family(shared_mobject)
+    if len(family) != len(shared_family):
+        return
+
+    for (submobject, shared_submobject) in zip(family, shared_family):
+        if type(submobject) is not type(shared_submobject):
+            continue
+        for key in mobject_buffer_attributes:
+            buffer = submobject.__dict__.get(key)
+            shared_buffer = shared_submobject.__dict__.get(key)
+            if isinstance(buffer, np.ndarray) and isinstance(shared_buffer, np.ndarray):
+                if buffer.dtype == shared_buffer.dtype and buffer.shape == shared_buffer.shape and np.array_equal(buffer, shared_buffer):
+                    memo[id(buffer)] = shared_buffer
+
+
+class GraphManagerRegistry():
+
+    """
+    graph -> GraphStateManager for one SceneManager, without keeping either alive.
+    The graph owns its manager (graph.state_manager), so the pair is collected together once the graph is unreachable.
+    """
+
+    def __init__(self):
+        self.graphs: weakref.WeakSet[DynamicMobjectGraph] = weakref.WeakSet()
+
+    def __getitem__(self, graph: DynamicMobjectGraph) -> GraphStateManager:
+        if graph not in self.graphs:
+            raise KeyError(graph)
+        return graph.state_manager
+    
+    def __setitem__(self, graph: DynamicMobjectGraph, manager: GraphStateManager):
+        graph.state_manager = manager
+        self.graphs.add(graph)
+
+    def __contains__(self, graph: DynamicMobjectGraph) -> bool:
+        return graph in self.graphs
+    
+    def __len__(self) -> int:
+        return len(self.graphs)
+
+    def pop(self, graph: DynamicMobjectGraph, default=None) -> GraphStateManager | None:
+        if graph not in self.graphs:
+            return default
+        self.graphs.discard(graph)
+        return graph.state_manager
+
+    def keys(self) -> List[DynamicMobjectGraph]:
+        return list(self.graphs)
+    
+    def values(self) -> List[GraphStateManager]:
+        return [ graph.state_manager for graph in list(self.graphs) ]
+    
+    def items(self) -> List[Tuple[DynamicMobjectGraph, GraphStateManager]]:
+        return [ (graph, graph.state_manager) for graph in list(self.graphs) ]
+
 
 class SceneManager():
 
-    _scene_manager: SceneManager | None = None
+    # every scene manager not yet collected, scene_manager() only falls back to one when it is the only one
+    _scene_managers: weakref.WeakSet[SceneManager] = weakref.WeakSet()
     _scene: Scene | None = None
 
     _client_context: bool = True
@@ -163,45 +296,122 @@ class SceneManager():
     @staticmethod
     def scene_manager():
 
-        scene_manager = SceneManager._scene_manager
-        
-        if scene_manager is None:
+        """
+        The active scene manager of the calling context, so several scenes can be built in one process (threads or asyncio tasks).
+        Outside of any scene's context (SceneManager.activate(), or a render()), falls back to the scene manager only while there is exactly one,
+        with several scenes alive there is no telling which one the caller means.
+        Graphs keep the scene manager they were created under (graph.scene_manager), prefer that when a graph is at hand.
+        """
+
+        scene_manager = current_scene_manager.get()
+        if scene_manager is not None:
+            return scene_manager
+
+        scene_managers = list(SceneManager._scene_managers)
+        if len(scene_managers) > 1:
+            # a scene and its manager reference each other through the patched scene.add() / wait() / remove(), so finished scenes linger until a collection
+            gc.collect()
+            scene_managers = list(SceneManager._scene_managers)
+
+        if len(scene_managers) == 0:
             raise Exception("Missing attach_progress_interceptors(self) in the body of `def construct(self)`")
         
-        return scene_manager
+        if len(scene_managers) > 1:
+            raise Exception(
+                f"{len(scene_managers)} scenes are alive, and none of them is active in this context. "
+                "Build mobjects inside `with scene.scene_manager.activate():` (scene.render() does this for construct())."
+            )
+        
+        return scene_managers[0]
     
     def __init__(
         self,
         scene: Scene
     ):
         self.scene = scene
-        self.graph_managers: Dict[DynamicMobjectGraph, GraphStateManager] = {}
+        self.graph_managers: GraphManagerRegistry = GraphManagerRegistry()
+        SceneManager._scene_managers.add(self)
 
-    def graph_of_root_mobject(self, root_mobject: MobjectIdentity):
+        # mobject ids are compact ints, numbered from 0 for every scene, next() on itertools.count is atomic under the GIL so no lock is needed
+        self.id_counter = itertools.count()
+
+        # identity -> { progress manager: keys of progress_manager.source_mobjects holding that identity }, maintained by GraphProgressManager
+        self.source_mobject_keys: weakref.WeakKeyDictionary[MobjectIdentity, weakref.WeakKeyDictionary[GraphProgressManager, Set[UUID]]] = weakref.WeakKeyDictionary()
+
+    def allocate_id(self) -> int:
+        return next(self.id_counter)
+    
+    @contextmanager
+    def activate(self):
+        token = current_scene_manager.set(self)
+        try:
+            yield self
+        finally:
+            current_scene_manager.reset(token)
+
+    @staticmethod
+    def graph_of_root_mobject(root_mobject: MobjectIdentity):
 
         def correct(root, graph):
             return root in graph.root_mobjects
+        
+        # roots own their graph, the memo and the scan are only reached if that reference is stale
+        if root_mobject._graph is not None and correct(root_mobject, root_mobject._graph):
+            return root_mobject._graph
 
         if root_mobject in graph_references_memo:
-            graph = graph_references_memo[root_mobject]
-            if correct(root_mobject, graph):
+            graph = graph_references_memo[root_mobject]()
+            if graph is not None and correct(root_mobject, graph):
                 return graph
             
-        for graph in graph_references:
+        for graph in list(graph_references):
             if correct(root_mobject, graph):
-                graph_references_memo[root_mobject] = graph
+                graph_references_memo[root_mobject] = weakref.ref(graph)
                 return graph
             
         raise Exception()
 
-        for manager in self.graph_managers.values():
-            if root_mobject in manager.graph.root_mobjects:
-                return manager.graph
-            
-        raise Exception()
 
     def graph_manager(self, graph: DynamicMobjectGraph):
         return self.graph_managers[graph]
+    
+    def memory_report(self) -> Dict[str, int]:
+
+        """
+        Counts what this scene currently keeps alive, to check that long renders stay flat.
+        points_nbytes covers every live graph, progress snapshots included, since snapshots are graphs too.
+        """
+
+        graphs = self.graph_managers.keys()
+        progress_managers = [ manager.progress_manager for manager in self.graph_managers.values() if manager.progress_manager is not None ]
+
+        points_nbytes = 0
+        for graph in graphs:
+            for root_mobject in graph.root_mobjects:
+                for mobject in root_mobject.current_dynamic_mobject.get_family():
+                    points_nbytes += mobject.points.nbytes
+
+        return {
+            "graphs": len(graphs),
+            "graph_references": len(graph_references),
+            "mobjects": sum(len(graph.id_index) for graph in graphs),
+            "progress_managers": len(progress_managers),
+            "snapshot_graphs": sum((pm.source_graph is not None) + (pm.target_graph is not None) for pm in progress_managers),
+            "points_nbytes": points_nbytes,
+            "composes": sum(manager.compose_count for manager in self.graph_managers.values()),
+        }
+
+    def replace_source_mobject(self, mobject: MobjectIdentity, replacement: MobjectIdentity):
+
+        owners = self.source_mobject_keys.get(mobject)
+        if owners is None:
+            return
+        
+        for progress_manager, keys in list(owners.items()):
+            if progress_manager.graph not in self.graph_managers:
+                continue
+            for id in list(keys):
+                progress_manager.set_source_mobject(id, replacement)
 
     def scene_add(self, mobject: DynamicMobject):
         self.graph_managers[mobject.graph].scene_add(mobject.identity)
@@ -229,6 +439,7 @@ class GraphProgressManager():
     ):
         self.scene = scene
         self.graph = graph
+        self.scene_manager = graph.scene_manager
 
         # copied mobjects from stack, f(id-carrier)
         self.source_graph: DynamicMobjectGraph | None = None
@@ -237,6 +448,39 @@ class GraphProgressManager():
         # stack mobjects, id-carries
         self.source_mobjects: Dict[UUID, MobjectIdentity] = {}
         self.target_mobjects: Dict[UUID, MobjectIdentity] = {}
+
+    def set_source_mobjects(self, source_mobjects: Dict[UUID, MobjectIdentity]):
+
+        for id, mobject in self.source_mobjects.items():
+            self.unindex_source_mobject(id, mobject)
+
+        self.source_mobjects = {}
+        for id, mobject in source_mobjects.items():
+            self.set_source_mobject(id, mobject)
+
+    def set_source_mobject(self, id: UUID, mobject: MobjectIdentity):
+
+        previous_mobject = self.source_mobjects.get(id)
+        if previous_mobject is not None:
+            self.unindex_source_mobject(id, previous_mobject)
+
+        self.source_mobjects[id] = mobject
+        owners = self.scene_manager.source_mobject_keys.setdefault(mobject, weakref.WeakKeyDictionary())
+        owners.setdefault(self, set()).add(id)
+
+    def unindex_source_mobject(self, id: UUID, mobject: MobjectIdentity):
+
+        source_mobject_keys = self.scene_manager.source_mobject_keys
+        owners = source_mobject_keys.get(mobject)
+        if owners is None or self not in owners:
+            return
+        
+        keys = owners[self]
+        keys.discard(id)
+        if empty(keys):
+            del owners[self]
+        if empty(owners):
+            del source_mobject_keys[mobject]
     
     def save_source_graph(self, clear_source_target_flags=False):
 
@@ -260,9 +504,11 @@ class GraphProgressManager():
                 mobject.identity.from_mobject = None
                 mobject.reactive_lock = False
 
-        self.source_graph = self.graph.copy()
+        # after a transform the graph matches the target snapshot, otherwise the previous source snapshot
+        previous_graph = self.target_graph if self.target_graph is not None else self.source_graph
+        self.source_graph = self.graph.progress_snapshot(previous_graph)
         self.target_graph = None
-        self.source_mobjects = { mobject.id: mobject for mobject in self.graph.mobjects }
+        self.set_source_mobjects({ mobject.id: mobject for mobject in self.graph.mobjects })
         self.target_mobjects = None
 
     def save_target_graph(self):
@@ -274,7 +520,7 @@ class GraphProgressManager():
             mobject.target_id = None # this isn't applied to GOC -> target_graph
             mobject.reactive_lock = False
 
-        self.target_graph = self.graph.copy()
+        self.target_graph = self.graph.progress_snapshot(self.source_graph)
         self.target_mobjects = { mobject.id: mobject for mobject in self.graph.mobjects }
 
         """ 
@@ -375,8 +621,11 @@ class AbstractDynamicTransformManager():
         self.graph = graph
         self.source_graph = source_graph
         self.target_graph = target_graph
-        self.scene_manager = SceneManager.scene_manager()
+        self.scene_manager = graph.scene_manager
         self.scene = self.scene_manager.scene
+
+        # introduced mobjects, TransformState.accept_transform_manager() swaps in its own dict
+        self.hashset: Dict[MobjectIdentity, bool] = {}
     
     def begin_transforms(self):
 
@@ -400,7 +649,7 @@ class AbstractDynamicTransformManager():
         # Subsequent partial-transforms will skip to animating the existing transform_containers, that have not yet been animated by previous partial-transforms
         # self.graph.subscribe(lambda graph: self.end_transforms(), self.subscription_id)
         
-        self.transform_descriptor = GraphTransformDescriptor(self.source_graph.copy(), self.target_graph.copy())
+        self.transform_descriptor = GraphTransformDescriptor(*self.descriptor_graphs())
         self.transform_containers = { id: TransformContainer(id) for id in self.transform_descriptor.ids() }
         self.save_recover_point()
 
@@ -426,6 +675,9 @@ class AbstractDynamicTransformManager():
         self.restructure_participant_observers(participant_observers=self.transform_containers.keys())
     
 
+    def descriptor_graphs(self) -> Tuple[DynamicMobjectGraph, DynamicMobjectGraph]:
+        return (self.source_graph.copy(), self.target_graph.copy())
+
     def filter_observers(self, observers):
 
         arr = []
@@ -440,27 +692,27 @@ class AbstractDynamicTransformManager():
         
         # remember that there can be two (mobject.id) observers per transform_container[id], in the case of replacement_transform
 
+        def has_points_in_family(m):
+            stack = [ m ]
+            while stack:
+                m = stack.pop()
+                if m.has_points():
+                    return True
+                stack.extend(m.submobjects)
+            return False
+
+        children_of = self.transform_descriptor.children_of
+
         for mobject in self.filter_observers(self.observers()):
             if mobject.id in participant_observers:
+
+                container = self.transform_containers[mobject.id]
+                child_containers = [ self.transform_containers[id] for id in children_of.get(mobject.id, []) ]
                 
-                def is_source_or_target_parent(child_id):
-                    return (
-                        self.transform_descriptor.is_source_parent(mobject.id, child_id) or
-                        self.transform_descriptor.is_target_parent(mobject.id, child_id) # is_xyz_parent allows clones, hopefully using clones here is okay
-                    )
-                
-                mobject.submobjects = [ self.transform_containers[mobject.id], *[ self.transform_containers[id] for id in self.transform_descriptor.ids() if is_source_or_target_parent(id) ] ]
-
-                def has_points_recursive(m):
-                    if m.has_points():
-                        return True
-                    for submobject in m.submobjects:
-                        if has_points_recursive(submobject):
-                            return True
-                    return False
-                
-                if not has_points_recursive(self.transform_containers[mobject.id]):
-                    mobject.submobjects = [ self.transform_containers[id] for id in self.transform_descriptor.ids() if is_source_or_target_parent(id) ]
+                if has_points_in_family(container):
+                    mobject.submobjects = [ container, *child_containers ]
+                else:
+                    mobject.submobjects = child_containers
 
 
     @abstractmethod
@@ -485,7 +737,7 @@ class AbstractDynamicTransformManager():
         """
 
         if self.transform_descriptor.is_introducer(id):
-            container.points = VMobject().points
+            container.points = empty_points
             container.submobjects = []
         else:
             container.points = self.transform_descriptor.find_source_dynamic_mobject(id).copy().points
@@ -575,6 +827,109 @@ class AbstractDynamicTransformManager():
                 f"{next_transform_manager.abstract_dynamic_transform_cls.__name__}{next_transform_manager.constructor_name()} \n"
             )
         
+class GraphSkeleton():
+
+    """
+    The topology and id flags of a DynamicMobjectGraph, as parallel columns indexed by row.
+    GraphTransformDescriptor classifies ids on skeletons, the graph is only touched to hand out a DynamicMobject for a row.
+    """
+
+    def __init__(self, graph: DynamicMobjectGraph):
+        self.graph = graph
+        self.identities: List[MobjectIdentity] = graph.mobjects
+
+        identity_rows = { identity: row for row, identity in enumerate(self.identities) }
+
+        self.ids: List[UUID] = [ identity.id for identity in self.identities ]
+        self.rows: Dict[UUID, int] = { id: row for row, id in enumerate(self.ids) }
+        self.source_ids: List[UUID | None] = [ identity.source_id for identity in self.identities ]
+        self.target_ids: List[UUID | None] = [ identity.target_id for identity in self.identities ]
+        self.parents: List[int] = [ identity_rows.get(identity.parent, -1) for identity in self.identities ]
+
+        # Euler tour, the subtree of a row is preorder_rows[tin[row]:tout[row]], so an ancestry test is two integer comparisons
+        children: List[List[int]] = [ [] for _ in self.identities ]
+        roots: List[int] = []
+        for row, parent in enumerate(self.parents):
+            (roots if parent == -1 else children[parent]).append(row)
+
+        self.tin: List[int] = [ 0 ] * len(self.identities)
+        self.tout: List[int] = [ 0 ] * len(self.identities)
+        self.preorder_rows: List[int] = []
+
+        stack: List[Tuple[int, bool]] = [ (row, False) for row in reversed(roots) ]
+        while stack:
+            (row, exiting) = stack.pop()
+            if exiting:
+                self.tout[row] = len(self.preorder_rows)
+                continue
+            self.tin[row] = len(self.preorder_rows)
+            self.preorder_rows.append(row)
+            stack.append((row, True))
+            stack.extend((child, False) for child in reversed(children[row]))
+
+        # source_id -> rows carrying it, in row order, for the finders that look for clones of an id
+        self.source_id_rows: Dict[UUID, List[int]] = {}
+        for row, source_id in enumerate(self.source_ids):
+            if source_id is not None:
+                self.source_id_rows.setdefault(source_id, []).append(row)
+
+    def contains(self, id: UUID) -> bool:
+        return id in self.rows
+
+    def row(self, id: UUID) -> int:
+        if id not in self.rows:
+            raise Exception(f"No mobject with id {id} found in graph")
+        return self.rows[id]
+    
+    def dynamic_mobject(self, row: int | None) -> DynamicMobject | None:
+        if row is None:
+            return None
+        return self.identities[row].current_dynamic_mobject
+    
+    def has_ancestor(self, row: int, ancestor_id: UUID) -> bool:
+        # a row counts as its own ancestor
+        ancestor = self.rows.get(ancestor_id)
+        if ancestor is None:
+            return False
+        return self.tin[ancestor] <= self.tin[row] < self.tout[ancestor]
+    
+    def subtree_rows(self, row: int) -> List[int]:
+        return self.preorder_rows[self.tin[row]:self.tout[row]]
+
+
+class TransformClassification():
+
+    """
+    How a GraphTransformDescriptor sorts its ids, computed once when the descriptor is built and read-only afterwards.
+    removers / introducers / transformers partition ids, scene_removers / scene_introducers are the ids found in only one of the two graphs.
+    """
+
+    __slots__ = ("ids", "removers", "introducers", "transformers", "scene_removers", "scene_introducers", "prevent_ids")
+
+    def __init__(
+        self,
+        ids: Set[UUID],
+        removers: Set[UUID],
+        introducers: Set[UUID],
+        scene_removers: Set[UUID],
+        scene_introducers: Set[UUID],
+        prevent_ids: Set[UUID]
+    ):
+        self.ids: frozenset[UUID] = frozenset(ids)
+        self.removers: frozenset[UUID] = frozenset(removers)
+        self.introducers: frozenset[UUID] = frozenset(introducers)
+        self.transformers: frozenset[UUID] = self.ids - self.removers - self.introducers
+        self.scene_removers: frozenset[UUID] = frozenset(scene_removers)
+        self.scene_introducers: frozenset[UUID] = frozenset(scene_introducers)
+        self.prevent_ids: frozenset[UUID] = frozenset(prevent_ids)
+
+    def __repr__(self):
+        return (
+            f"TransformClassification(ids={len(self.ids)}, removers={sorted(self.removers)}, introducers={sorted(self.introducers)}, "
+            f"transformers={sorted(self.transformers)}, prevent_ids={sorted(self.prevent_ids)})"
+        )
+
+
 class GraphTransformDescriptor():
 
     def __init__(
@@ -585,12 +940,64 @@ class GraphTransformDescriptor():
         self.source_graph = source_graph
         self.target_graph = target_graph
 
-        self.source_memo = {}
-        self.target_memo = {}
+        self.source_skeleton = GraphSkeleton(source_graph)
+        self.target_skeleton = GraphSkeleton(target_graph)
+
+        # id -> skeleton row
+        self.source_memo: Dict[UUID, int | None] = {}
+        self.target_memo: Dict[UUID, int | None] = {}
+
+        # both graphs are snapshots, so every id is resolved and classified up front and the queries below are set lookups
+        ids = set(self.source_skeleton.ids).union(self.target_skeleton.ids)
+        for id in ids:
+            self.find_source_row(id)
+            self.find_target_row(id)
+
+        self.classification = TransformClassification(
+            ids=ids,
+            removers={ id for id in ids if self.has_source(id) and not self.has_target(id) },
+            introducers={ id for id in ids if self.has_target(id) and not self.has_source(id) },
+            scene_removers={ id for id in ids if not self.target_skeleton.contains(id) },
+            scene_introducers={ id for id in ids if not self.source_skeleton.contains(id) },
+            prevent_ids=self.compute_prevent_ids(ids)
+        )
+
+        # parent id -> ids that are its source or target child, what is_source_parent() / is_target_parent() answer pair by pair
+        self.children_of: Dict[UUID, List[UUID]] = self.compute_children_of(ids)
+
+    def prevent_ids(self) -> frozenset[UUID]:
+        return self.classification.prevent_ids
+
+    def compute_children_of(self, ids: Set[UUID]) -> Dict[UUID, List[UUID]]:
+
+        # several ids can resolve to one row (clones), each of them is a parent of the row's children
+        source_row_ids: Dict[int, List[UUID]] = {}
+        target_row_ids: Dict[int, List[UUID]] = {}
+        for id in ids:
+            if self.find_source_row(id) is not None:
+                source_row_ids.setdefault(self.find_source_row(id), []).append(id)
+            if self.find_target_row(id) is not None:
+                target_row_ids.setdefault(self.find_target_row(id), []).append(id)
+
+        children_of: Dict[UUID, List[UUID]] = {}
+        for id in ids:
+            parent_ids: Set[UUID] = set()
+
+            source_row = self.find_source_row(id)
+            if source_row is not None:
+                parent_ids.update(source_row_ids.get(self.source_skeleton.parents[source_row], []))
 
-    def prevent_ids(self):
+            target_row = self.find_target_row(id)
+            if target_row is not None:
+                parent_ids.update(target_row_ids.get(self.target_skeleton.parents[target_row], []))
+
+            for parent_id in parent_ids:
+                children_of.setdefault(parent_id, []).append(id)
+
+        return children_of
+
+    def compute_prevent_ids(self, ids: Set[UUID]) -> Set[UUID]:
         
-        ids = self.ids()
         prevent_ids = set()
 
         # finding (idS, idT) such that 
@@ -600,12 +1007,13 @@ class GraphTransformDescriptor():
         # we remove the idS by putting it in prevent_ids() for the TransformItinerary to set_opacity(0)
 
         
+        # runs before self.classification exists, so scene-remover/introducer checks go to the skeletons
         for id in ids:
-            if self.is_scene_remover(id) and self.has_target(id):
-                target = self.find_target_dynamic_mobject(id)
-                if self.is_scene_introducer(target.id) and self.has_source(target.id):
-                    source = self.find_source_dynamic_mobject(target.id)
-                    if source.id == id:
+            if not self.target_skeleton.contains(id) and self.has_target(id):
+                target_id = self.target_skeleton.ids[self.find_target_row(id)]
+                if not self.source_skeleton.contains(target_id) and self.has_source(target_id):
+                    source_id = self.source_skeleton.ids[self.find_source_row(target_id)]
+                    if source_id == id:
                         prevent_ids.add(id)
 
         return prevent_ids
@@ -638,63 +1046,86 @@ class GraphTransformDescriptor():
 
         return prevent_ids
 
-    def ids(self):
-        return { mobject.id for mobject in self.source_graph.mobjects }.union({ mobject.id for mobject in self.target_graph.mobjects })
+    def ids(self) -> frozenset[UUID]:
+        return self.classification.ids
 
-    def find_source_dynamic_mobject_(self, id: UUID) -> DynamicMobject | None:
+    def find_source_row_(self, id: UUID) -> int | None:
         if id is None:
             raise Exception()
         
-        # DIRECT MATCH
-        if self.source_graph.contains(id):
-            return self.source_graph.get_dynamic_mobject(id)
-        else:
+        source = self.source_skeleton
+        target = self.target_skeleton
+        visited: Set[UUID] = set()
+
+        while True:
+            visited.add(id)
+
+            # DIRECT MATCH
+            if source.contains(id):
+                return source.rows[id]
+            
             # DIRECT FLAG
-            source_id = self.target_graph.get_dynamic_mobject(id).source_id
+            source_id = target.source_ids[target.row(id)]
 
-            if not none(source_id) and self.source_graph.contains(source_id):
-                return self.source_graph.get_dynamic_mobject(source_id)
+            if not none(source_id) and source.contains(source_id):
+                return source.rows[source_id]
 
             # SOURCE-FINDER-1
             # It's unlikely that m1.target_id = m2 would be set on an m2-introducer. 
 
-            # SOURCE-FINDER 2
-            for mobject in self.target_graph.dynamic_mobjects:
-                if mobject.id == source_id:
-                    if self.find_source_dynamic_mobject_(mobject.id) is not None:
-                        return self.find_source_dynamic_mobject_(mobject.id)
+            # SOURCE-FINDER 2, follow source_id through the target graph
+            if not none(source_id) and target.contains(source_id):
+                if source_id in visited:
+                    raise Exception(f"source_id cycle through id {source_id}")
+                id = source_id
+                continue
                     
             return None
 
-    def find_source_dynamic_mobject(self, id: UUID) -> DynamicMobject | None:
+    def find_source_row(self, id: UUID) -> int | None:
         if id in self.source_memo:
             return self.source_memo[id]
         else:
-            source = self.find_source_dynamic_mobject_(id)
+            source = self.find_source_row_(id)
             self.source_memo[id] = source
             return source
-        
 
-    def find_target_dynamic_mobject_(self, id: UUID, checked: List[DynamicMobject]) -> DynamicMobject | None:
-        if id is None:
-            raise Exception()
+    def find_source_dynamic_mobject(self, id: UUID) -> DynamicMobject | None:
+        return self.source_skeleton.dynamic_mobject(self.find_source_row(id))
         
-        checked.add(id)
 
-        # DIRECT MATCH
-        if self.target_graph.contains(id):
-            return self.target_graph.get_dynamic_mobject(id)
-        else:
+    def find_target_row_(self, id: UUID, checked: Set[UUID]) -> int | None:
+
+        """
+        Depth-first over candidate ids with an explicit stack, each frame holds the candidates of one id that are still to be tried.
+        resolve() is the non-recursive part for a single id.
+        """
+
+        source = self.source_skeleton
+        target = self.target_skeleton
+
+        def resolve(id: UUID) -> Tuple[int | None, Iterator[UUID] | None]:
+
+            if id is None:
+                raise Exception()
+            
+            checked.add(id)
+
+            # DIRECT MATCH
+            if target.contains(id):
+                return (target.rows[id], None)
+            
             # DIRECT FLAG
-            target_id = self.source_graph.get_dynamic_mobject(id).target_id
+            source_row = source.row(id)
+            target_id = source.target_ids[source_row]
 
-            if not none(target_id) and self.target_graph.contains(target_id):
-                return self.target_graph.get_dynamic_mobject(target_id)
+            if not none(target_id) and target.contains(target_id):
+                return (target.rows[target_id], None)
 
             # TARGET-FINDER-1, given a <-sid- a.clone(), then target(a) = a.clone(), if there only exists one a.clone()
-            for mobject in self.target_graph.dynamic_mobjects:
-                if mobject.source_id == id:
-                    return mobject
+            clone_rows = target.source_id_rows.get(id)
+            if clone_rows:
+                return (clone_rows[0], None)
                 
                     # a = MathString("a")
                     # tex1 = MathTex(a)
@@ -730,13 +1161,8 @@ class GraphTransformDescriptor():
 
 
             # TARGET-FINDER-2, if source_graph DM is an a.clone() to another source_graph[a], check if source_graph[a] has a corresponding target_mobject
-            #cross_id = self.source_graph.get_dynamic_mobject(id).source_id
-            for mobject in self.source_graph.dynamic_mobjects:
-                if mobject.source_id == id:
-                    if mobject.id not in checked:
-                        if self.find_target_dynamic_mobject_(mobject.id, checked) is not None:
-                            return self.find_target_dynamic_mobject_(mobject.id, checked)
-                    
+            candidates = [ source.ids[row] for row in source.source_id_rows.get(id, []) ]
+            
                         # a = MathString("a")
                         # tex1 = MathTex(a, a)
                         # tex2 = MathTex(a)      # this policy enables both tex1[0] and tex1[1] to merge onto tex2[0]
@@ -752,54 +1178,74 @@ class GraphTransformDescriptor():
 
             """
 
-            cross_id = self.source_graph.get_dynamic_mobject(id).source_id
-            for mobject in self.source_graph.dynamic_mobjects:
-                if mobject.id == cross_id:
-                    if mobject.id not in checked:
-                        if self.find_target_dynamic_mobject_(mobject.id, checked) is not None:
-                            return self.find_target_dynamic_mobject_(mobject.id, checked)
+            cross_id = source.source_ids[source_row]
+            if not none(cross_id) and source.contains(cross_id):
+                candidates.append(cross_id)
+
+            return (None, iter(candidates))
+        
+        (row, candidates) = resolve(id)
+        if row is not None:
+            return row
+        
+        stack = [ candidates ]
+        while stack:
+            # checked grows while searching, so it is tested when a candidate is reached, as the recursive version did
+            candidate = next((candidate for candidate in stack[-1] if candidate not in checked), None)
+
+            if candidate is None:
+                stack.pop()
+                continue
+
+            (row, candidates) = resolve(candidate)
+            if row is not None:
+                return row
+            stack.append(candidates)
                     
-            return None
+        return None
             
-    def find_target_dynamic_mobject(self, id: UUID) -> DynamicMobject | None:
+    def find_target_row(self, id: UUID) -> int | None:
 
         if id in self.target_memo:
             return self.target_memo[id]
         else:
             checked = set()
-            target = self.find_target_dynamic_mobject_(id, checked=checked)
+            target = self.find_target_row_(id, checked=checked)
             self.target_memo[id] = target
             return target
+        
+    def find_target_dynamic_mobject(self, id: UUID) -> DynamicMobject | None:
+        return self.target_skeleton.dynamic_mobject(self.find_target_row(id))
 
     def has_source(self, id: UUID):
-        return True if self.find_source_dynamic_mobject(id) is not None else False
+        return True if self.find_source_row(id) is not None else False
     
     def has_target(self, id: UUID):
-        return True if self.find_target_dynamic_mobject(id) is not None else False
+        return True if self.find_target_row(id) is not None else False
     
     def is_remover(self, id: UUID):
-        return self.has_source(id) and not self.has_target(id)
+        return id in self.classification.removers
     
     def is_introducer(self, id: UUID):
-        return self.has_target(id) and not self.has_source(id)
+        return id in self.classification.introducers
         
     def is_transformer(self, id: UUID):
-        return not self.is_remover(id) and not self.is_introducer(id)
+        return id in self.classification.transformers
     
     def is_scene_remover(self, id: UUID):
-        return self.source_graph.contains(id) and not self.target_graph.contains(id)
+        return id in self.classification.scene_removers
     
     def is_scene_introducer(self, id: UUID):
-        return self.target_graph.contains(id) and not self.source_graph.contains(id)
+        return id in self.classification.scene_introducers
     
     def is_source_parent(self, parent_id, child_id):
         # maybe find child, check child.parent which may be None
 
-        child = self.find_source_dynamic_mobject(child_id)
-        parent = self.find_source_dynamic_mobject(parent_id)
+        child = self.find_source_row(child_id)
+        parent = self.find_source_row(parent_id)
 
         if child is not None and parent is not None:
-            if child.parent is parent:
+            if self.source_skeleton.parents[child] == parent:
                 return True
             
         return False
@@ -807,11 +1253,11 @@ class GraphTransformDescriptor():
     def is_target_parent(self, parent_id, child_id):
         # maybe find child, check child.parent which may be None
 
-        child = self.find_target_dynamic_mobject(child_id)
-        parent = self.find_target_dynamic_mobject(parent_id)
+        child = self.find_target_row(child_id)
+        parent = self.find_target_row(parent_id)
 
         if child is not None and parent is not None:
-            if child.parent is parent:
+            if self.target_skeleton.parents[child] == parent:
                 return True
             
         return False
@@ -845,41 +1291,21 @@ class GraphTransformDescriptor():
 
     def is_source_ancestor(self, ancestor_id: UUID, child_id: UUID):
 
-        def recursive_has_ancestor_with_id(mobject: DynamicMobject):
-
-            if mobject.id == ancestor_id:
-                return True
-
-            if mobject.parent:
-                return recursive_has_ancestor_with_id(mobject.parent)
-            else:
-                return False
-
-        source_child = self.find_source_dynamic_mobject(child_id)
+        source_child = self.find_source_row(child_id)
 
         if source_child is None:
             return False
         else:
-            return recursive_has_ancestor_with_id(source_child)
+            return self.source_skeleton.has_ancestor(source_child, ancestor_id)
         
     def is_target_ancestor(self, ancestor_id: UUID, child_id: UUID):
 
-        def recursive_has_ancestor_with_id(mobject: DynamicMobject):
-
-            if mobject.id == ancestor_id:
-                return True
-
-            if mobject.parent:
-                return recursive_has_ancestor_with_id(mobject.parent)
-            else:
-                return False
-
-        target_child = self.find_target_dynamic_mobject(child_id)
+        target_child = self.find_target_row(child_id)
 
         if target_child is None:
             return False
         else:
-            return recursive_has_ancestor_with_id(target_child)
+            return self.target_skeleton.has_ancestor(target_child, ancestor_id)
         
 
 def reactive(dynamic_mobject_method):
@@ -927,6 +1353,18 @@ class GraphStateInterface():
     def end_edit(self, mobject: MobjectIdentity):
         raise NotImplementedError()
 
+    @abstractmethod
+    def begin_transaction(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def end_transaction(self):
+        raise NotImplementedError()
+
+    @abstractmethod
+    def abort_transaction(self):
+        raise NotImplementedError()
+
 
     @abstractmethod
     def accept_transform_manager(
@@ -1009,6 +1447,17 @@ class TransformState(GraphStateInterface):
         tex[0].some_edit() # -> causes TransformState.end()
         """
 
+    def begin_transaction(self):
+        self.manager.set_state(DefaultState(self.manager))
+        self.manager.state.begin_transaction()
+
+    def end_transaction(self):
+        # transactions only stay open in EditState
+        raise Exception("end_transaction() called without a matching begin_transaction()")
+
+    def abort_transaction(self):
+        raise Exception("abort_transaction() called without a matching begin_transaction()")
+
     def accept_transform_manager(
         self, 
         transform_manager: AbstractDynamicTransformManager
@@ -1078,6 +1527,17 @@ class ProgressToEmpty(GraphStateInterface):
 
         if self.complete():
             self.manager.set_state(DefaultState(self.manager))
+
+    def begin_transaction(self):
+        # tex.batch() after a remover animation, e.g. FadeOut(tex[0]), that has not yet completed
+        self.manager.set_state(DefaultState(self.manager))
+        self.manager.state.begin_transaction()
+
+    def end_transaction(self):
+        raise Exception("end_transaction() called without a matching begin_transaction()")
+
+    def abort_transaction(self):
+        raise Exception("abort_transaction() called without a matching begin_transaction()")
     
     def construct_remover_animation(self, mobject: MobjectIdentity):
         return
@@ -1096,6 +1556,16 @@ class DefaultState(GraphStateInterface):
         self.manager.set_state(EditState(self.manager, mobject))
         self.manager.state.begin_edit(mobject)
 
+    def begin_transaction(self):
+        self.manager.set_state(EditState(self.manager, None))
+        self.manager.state.begin_transaction()
+
+    def end_transaction(self):
+        raise Exception("end_transaction() called without a matching begin_transaction()")
+
+    def abort_transaction(self):
+        raise Exception("abort_transaction() called without a matching begin_transaction()")
+
     def accept_transform_manager(
         self, 
         transform_manager: AbstractDynamicTransformManager
@@ -1161,7 +1631,7 @@ class EditState(GraphStateInterface):
     ):
         super().__init__(manager)
         self.graph = manager.graph
-        self.edit_manager = GraphEditManager(manager.graph, mobject)
+        self.edit_manager = GraphEditManager(manager.graph)
 
     def begin(self):
         
@@ -1173,7 +1643,7 @@ class EditState(GraphStateInterface):
                 raise Exception()
             
     def end(self):
-        return
+        self.manager.record_edit(self.edit_manager)
     
     def begin_edit(self, mobject: MobjectIdentity):
 
@@ -1185,6 +1655,8 @@ class EditState(GraphStateInterface):
     def end_edit(self, mobject: MobjectIdentity):
 
         if mobject is None: ###
+            if self.edit_manager.in_transaction():
+                return
             self.manager.set_state(DefaultState(self.manager))
             return ###
         
@@ -1192,6 +1664,21 @@ class EditState(GraphStateInterface):
 
         if self.edit_manager.finished():
             self.manager.set_state(DefaultState(self.manager))
+
+    def begin_transaction(self):
+        self.edit_manager.begin_transaction()
+
+    def end_transaction(self):
+        self.edit_manager.end_transaction()
+
+        if self.edit_manager.finished():
+            self.manager.set_state(DefaultState(self.manager))
+
+    def abort_transaction(self):
+        self.edit_manager.abort_transaction()
+
+        if self.edit_manager.finished():
+            self.manager.set_state(DefaultState(self.manager))
         
 
 
@@ -1202,13 +1689,17 @@ class GraphStateManager():
         self.graph = graph
         self.state = DefaultState(self)
         self.progress_manager: Optional[GraphProgressManager] = None
-        self.scene_manager = SceneManager.scene_manager()
+        self.scene_manager = graph.scene_manager
+
+        # compose counters, last_edit_composes maps each recomposed mobject's id to how often the last edit composed it
+        self.compose_count = 0
+        self.last_edit_compose_count = 0
+        self.last_edit_composes: Dict[UUID, int] = {}
 
     def save_source_graph(self, clear_source_target_flags: bool = False):
 
         if self.progress_manager is None:
-            scene_manager = SceneManager.scene_manager()
-            self.progress_manager = GraphProgressManager(self.graph, scene_manager.scene)
+            self.progress_manager = GraphProgressManager(self.graph, self.scene_manager.scene)
 
         self.progress_manager.save_source_graph(clear_source_target_flags=clear_source_target_flags)
     
@@ -1218,6 +1709,11 @@ class GraphStateManager():
     def has_progress_manager(self):
         return self.progress_manager is not None
     
+    def record_edit(self, edit_manager: GraphEditManager):
+        self.compose_count += edit_manager.compose_count
+        self.last_edit_compose_count = edit_manager.compose_count
+        self.last_edit_composes = { mobject.id: count for mobject, count in edit_manager.compose_counts.items() }
+    
     
     def require_default_if_transform(self):
         if isinstance(self.state, (TransformState, ProgressToEmpty)):
@@ -1237,6 +1733,18 @@ class GraphStateManager():
     def end_edit(self, mobject: MobjectIdentity):
         self.state.end_edit(mobject)
 
+    def begin_transaction(self):
+        self.state.begin_transaction()
+
+    def end_transaction(self):
+        self.state.end_transaction()
+
+    def abort_transaction(self):
+        self.state.abort_transaction()
+
+    def in_transaction(self) -> bool:
+        return isinstance(self.state, EditState) and self.state.edit_manager.in_transaction()
+
     def accept_transform_manager(
         self,
         transform_manager: AbstractDynamicTransformManager
@@ -1265,13 +1773,32 @@ class GraphStateManager():
     
 class DynamicMobjectGraph(Mobject):
 
+    # when set, every cached read of graph.mobjects is checked against a full traversal
+    debug_cache: bool = False
+
     def manager(self) -> GraphStateManager:
-        scene_manager = SceneManager.scene_manager()
-        return scene_manager.graph_managers[self]
+        return self.scene_manager.graph_managers[self]
         
     def create_manager(self):
-        scene_manager = SceneManager.scene_manager()
-        scene_manager.graph_managers[self] = GraphStateManager(self)
+        self.scene_manager.graph_managers[self] = GraphStateManager(self)
+
+    def release(self):
+
+        """
+        Called once the graph has lost all of its roots (absorbed by connect_parent_child, or emptied by set_root_mobjects).
+        It is unregistered right away instead of waiting for collection, so scene_wait() and friends stop visiting it.
+        A graph in the middle of an edit is left alone, its manager is still on the call stack.
+        """
+
+        if not empty(self.root_mobjects):
+            return
+        
+        scene_manager = self.scene_manager
+        if self in scene_manager.graph_managers and isinstance(self.manager().state, EditState):
+            return
+        
+        graph_references.discard(self)
+        scene_manager.graph_managers.pop(self)
 
     def set_auto_disconnect_memory(self):
         self.auto_disconnect_memory = {}
@@ -1286,17 +1813,72 @@ class DynamicMobjectGraph(Mobject):
             )
                     
 
-    def __init__(self):
+    def __init__(self, scene_manager: SceneManager | None = None):
         super().__init__()
-        graph_references.append(self)
-        self.root_mobjects: Set[MobjectIdentity] = []
+        graph_references.add(self)
+        # a graph stays with the scene it was created under, snapshots and split-off components pass it along
+        self.scene_manager = scene_manager if scene_manager is not None else SceneManager.scene_manager()
+        self.version = 0
+        self.mobjects_cache: List[MobjectIdentity] | None = None
+        self.mobjects_cache_version = -1
+        self.id_index: Dict[UUID, MobjectIdentity] = {}
+        self.root_mobjects: Set[MobjectIdentity] = set()
         self.create_manager()
 
         self.auto_disconnect_memory: Dict[MobjectIdentity, Tuple[UUID, UUID, UUID]] = {}
 
+        # only set on progress snapshots, live mobject -> its copy in this snapshot
+        self.snapshot_sources: weakref.WeakKeyDictionary[MobjectIdentity, MobjectIdentity] | None = None
+
+
+    @property
+    def root_mobjects(self) -> Set[MobjectIdentity]:
+        return self._root_mobjects
+    
+    @root_mobjects.setter
+    def root_mobjects(self, root_mobjects: Set[MobjectIdentity]):
+
+        for root_mobject in getattr(self, "_root_mobjects", set()):
+            if root_mobject not in root_mobjects and root_mobject._graph is self:
+                root_mobject._graph = None
+
+        self._root_mobjects = root_mobjects
+        self.id_index = {}
+        for root_mobject in root_mobjects:
+            root_mobject._graph = self
+            self.index_mobjects(root_mobject)
+        self.bump_version()
+
+    def bump_version(self):
+        # any parent/child or root change, invalidates the cached membership of graph.mobjects
+        self.version += 1
+
+    def index_mobjects(self, root_mobject: MobjectIdentity):
+        for mobject in self.connected_from_root(root_mobject):
+            self.id_index[mobject.id] = mobject
+
+    def unindex_mobjects(self, root_mobject: MobjectIdentity):
+        for mobject in self.connected_from_root(root_mobject):
+            if self.id_index.get(mobject.id) is mobject:
+                del self.id_index[mobject.id]
+
+    def reindex_mobject(self, mobject: MobjectIdentity, prev_id: UUID, next_id: UUID):
+        if self.id_index.get(prev_id) is mobject:
+            del self.id_index[prev_id]
+        self.id_index[next_id] = mobject
 
     @property
     def mobjects(self) -> List[MobjectIdentity]:
+
+        if self.mobjects_cache_version != self.version:
+            self.mobjects_cache = self.traverse_mobjects()
+            self.mobjects_cache_version = self.version
+        elif DynamicMobjectGraph.debug_cache:
+            self.verify_mobjects_cache()
+        
+        return list(self.mobjects_cache)
+    
+    def traverse_mobjects(self) -> List[MobjectIdentity]:
         mobjects: Set[MobjectIdentity] = set()
 
         for root_mobject in self.root_mobjects:
@@ -1305,6 +1887,10 @@ class DynamicMobjectGraph(Mobject):
                 mobjects.add(mobject)
         
         return list(mobjects)
+    
+    def verify_mobjects_cache(self):
+        if set(self.mobjects_cache) != set(self.traverse_mobjects()):
+            raise Exception(f"Stale mobjects cache at graph version {self.version}, a structural change did not call bump_version()")
 
     def root_dynamic_mobjects(self):
         return [ mobject.current_dynamic_mobject for mobject in self.root_mobjects ]
@@ -1314,24 +1900,20 @@ class DynamicMobjectGraph(Mobject):
         return [ mobject.current_dynamic_mobject for mobject in self.mobjects ]
     
     def contains(self, id: UUID) -> bool:
-        for mobject in self.dynamic_mobjects:
-            if mobject.id == id:
-                return True
-            
-        return False
+        return id in self.id_index
     
     def find_dynamic_mobject(self, id: UUID) -> DynamicMobject | None:
-        for mobject in self.dynamic_mobjects:
-            if mobject.id == id:
-                return mobject
+        mobject = self.id_index.get(id)
+
+        if mobject is None:
+            return None
             
-        return None
+        return mobject.current_dynamic_mobject
 
     def __getitem__(self, id):
 
-        for mobject in self.mobjects:
-            if mobject.id == id:
-                return mobject
+        if id in self.id_index:
+            return self.id_index[id]
         
         raise Exception(f"No mobject with id={id} found in graph")
     
@@ -1346,15 +1928,7 @@ class DynamicMobjectGraph(Mobject):
     
     @staticmethod
     def connected_from_root(root_mobject: MobjectIdentity) -> Set[MobjectIdentity]:
-        mobjects: Set[MobjectIdentity] = set()
-
-        def recursive_extract(mobject: MobjectIdentity):
-            mobjects.add(mobject)
-            for child in mobject.children:
-                recursive_extract(child)
-
-        recursive_extract(root_mobject)
-        return mobjects
+        return set(preorder(root_mobject, lambda mobject: mobject.children))
     
     def __deepcopy__(self, memo):
 
@@ -1368,15 +1942,66 @@ class DynamicMobjectGraph(Mobject):
             # this will not occur in the current implementation, since deep-copying a DynamicMobject will not traverse any direct graph-references
             # if graph.__deepcopy__() is called, therefore, it must be from a graph.copy() call since dynamic_mobject.copy() will not reach the graph
         
-        copy_graph = DynamicMobjectGraph()
-        copy_root_mobjects = copy.deepcopy(self.root_mobjects, memo={ "override": True })
+        return self.snapshot({ "override": True })
+    
+    def snapshot(self, memo, bulk_buffers: bool = True) -> DynamicMobjectGraph:
+        if bulk_buffers:
+            seed_bulk_buffers([ root_mobject.current_dynamic_mobject for root_mobject in self.root_mobjects ], memo)
+        copy_graph = DynamicMobjectGraph(scene_manager=self.scene_manager)
+        copy_root_mobjects = copy.deepcopy(self.root_mobjects, memo=memo)
         copy_graph.root_mobjects = copy_root_mobjects
         return copy_graph
 
-    def copy(self) -> DynamicMobjectGraph:
-        copy_graph = copy.deepcopy(self)
+    def copy(self, bulk_buffers: bool = True) -> DynamicMobjectGraph:
+        # bulk_buffers=False gives every copied buffer its own allocation, see progress_snapshot()
+        copy_graph = self.snapshot({ "override": True }, bulk_buffers=bulk_buffers)
         copy_graph.create_manager()
         return copy_graph
+
+    def progress_snapshot(self, previous: DynamicMobjectGraph | None) -> DynamicMobjectGraph:
+
+        """
+        Copies the graph for GraphProgressManager, sharing every buffer that is equal to its counterpart in previous (an earlier progress snapshot).
+        Identities, dynamic-mobject shells and submobjects are still copied, since the progress manager rewrites ids, and attributes other than buffers are not compared.
+        Snapshots are only ever read (animations .copy() out of them), and replaced rather than mutated, so sharing buffers between them is safe.
+        Buffers are not bulk-allocated, a view into one bulk array would keep every buffer of that snapshot alive for as long as a later snapshot shares one of them.
+        """
+
+        memo = { "override": True }
+        if previous is not None and previous.snapshot_sources is not None:
+            for mobject in self.mobjects:
+                source = previous.snapshot_sources.get(mobject)
+                if source is not None:
+                    share_equal_buffers(mobject.current_dynamic_mobject, source.current_dynamic_mobject, memo)
+
+        copy_graph = self.snapshot(memo, bulk_buffers=False)
+        copy_graph.create_manager()
+
+        copy_graph.snapshot_sources = weakref.WeakKeyDictionary()
+        for mobject in self.mobjects:
+            copy_mobject = memo.get(id(mobject))
+            if copy_mobject is not None:
+                copy_graph.snapshot_sources[mobject] = copy_mobject
+
+        return copy_graph
+
+    @contextmanager
+    def transaction(self):
+
+        """
+        Defers every edit on this graph until the block exits, then recomposes each edited mobject and its ancestors once (deepest first).
+        Inside the block, mobjects are not recomposed, so their geometry and children reflect the state before the block.
+        If the block raises, nothing is recomposed and the exception propagates as is, the edits made before it stay applied but uncomposed.
+        """
+
+        manager = self.manager()
+        manager.begin_transaction()
+        try:
+            yield self
+        except BaseException:
+            manager.abort_transaction()
+            raise
+        manager.end_transaction()
     
     def set_root_mobjects(self, root_mobjects: Set[MobjectIdentity]):
 
@@ -1391,8 +2016,9 @@ class DynamicMobjectGraph(Mobject):
             if curr_root not in root_mobjects:
 
                 self.root_mobjects.remove(curr_root)
+                self.unindex_mobjects(curr_root)
                 
-                graph = DynamicMobjectGraph()
+                graph = DynamicMobjectGraph(scene_manager=self.scene_manager)
                 graph.root_mobjects = { curr_root }
                 
                 #curr_root.graph = graph
@@ -1400,12 +2026,20 @@ class DynamicMobjectGraph(Mobject):
         for next_root in root_mobjects:
             if next_root not in self.root_mobjects:
                 
-                next_root.graph.root_mobjects.remove(next_root)
+                next_root_graph = next_root.graph
+                next_root_graph.root_mobjects.remove(next_root)
+                next_root_graph.unindex_mobjects(next_root)
 
                 self.root_mobjects.add(next_root)
+                self.index_mobjects(next_root)
+                next_root._graph = self
+                next_root_graph.bump_version()
+                next_root_graph.release()
 
                 #next_root.graph = self
 
+        self.bump_version()
+
     def set_root(self, mobject: MobjectIdentity):
         self.set_root_mobjects({ mobject })
 
@@ -1431,76 +2065,59 @@ class DynamicMobjectGraph(Mobject):
             child.graph = None
         else: """
         if graph1 is not graph2:
-            root_connected_mobjects1 = graph1.mobjects
-            root_connected_mobjects2 = graph2.mobjects
-
-            
 
-            m = {}
-            for mobject in root_connected_mobjects1:
-                m[mobject.id] = mobject
+            m = graph1.id_index
+            graph2_id_index = graph2.id_index
 
-            def find_root(m: MobjectIdentity):
-                from_mobject = m.from_mobject
-                if from_mobject is None:
-                    return m
-                else:
-                    return find_root(from_mobject())
-                
+            # only ids present in both graphs need an auto-disconnect check, so walk the smaller index
+            (smaller_index, larger_index) = (m, graph2_id_index) if len(m) < len(graph2_id_index) else (graph2_id_index, m)
+            duplicate_mobjects = [ graph2_id_index[id] for id in smaller_index if id in larger_index ]
 
-            def connected_mobjects(m1: MobjectIdentity, m2: MobjectIdentity):
-                root1 = find_root(m1)
-                root2 = find_root(m2)
-                return root1 is root2
+            progress_mobjects = []
+            progress_manager = self.manager().progress_manager
+            if progress_manager is not None:
+                source_mobjects = progress_manager.source_mobjects
+                (smaller_index, larger_index) = (source_mobjects, graph2_id_index) if len(source_mobjects) < len(graph2_id_index) else (graph2_id_index, source_mobjects)
+                progress_mobjects = [ graph2_id_index[id] for id in smaller_index if id in larger_index and id not in m ]
 
-
-            def auto_disconnect_check(new_mobject: MobjectIdentity):
+            for new_mobject in duplicate_mobjects:
 
                 #if use_custom_breakpoint() and new_mobject.id == 1:
                 #    print("AT THIS STATE M IS ", id(new_mobject), new_mobject.id in m)
-        
-                if new_mobject.id in m:
-                    #if self in [ f() for f in new_mobject.tracked_graphs ]:
-                    #    new_mobject.current_dynamic_mobject.source_id = new_mobject.id
-                    #    new_mobject.tracked_graphs = [ ]
-                    current_mobject = m[new_mobject.id]
-                    if connected_mobjects(new_mobject, current_mobject):
-                        new_mobject.current_dynamic_mobject.source_id = new_mobject.id
-
-                    #if m[new_mobject.id] in new_mobject.tracked_mobjects():
-                    #    new_mobject.current_dynamic_mobject.source_id = new_mobject.id
-                    #    new_mobject._tracked_mobjects = []
-
-                    #elif new_mobject in m[new_mobject.id].tracked_mobjects():
-                    #    new_mobject.current_dynamic_mobject.source_id = new_mobject.id
-                    #    new_mobject._tracked_mobjects = []
-                    
-                    new_mobject.current_dynamic_mobject.id = uuid.uuid4()
-                else:
-                    progress_manager = self.manager().progress_manager
-                    if progress_manager is not None:
-                        if new_mobject.id in progress_manager.source_mobjects:
-                            progress_manager.source_mobjects[new_mobject.id] = new_mobject
 
-            for mobject in root_connected_mobjects2:
-                auto_disconnect_check(mobject)
-                continue
-                if mobject.id in m:
-                    raise Exception(
-                        "Mobject graph cannot contain duplicate ids."
-                        "Use mobject.clone() instead of mobject.copy() for duplication."
-                    )
+                current_mobject = m[new_mobject.id]
+                if new_mobject.find_root() is current_mobject.find_root():
+                    new_mobject.current_dynamic_mobject.source_id = new_mobject.id
+                
+                new_mobject.current_dynamic_mobject.id = self.scene_manager.allocate_id()
+
+            for new_mobject in progress_mobjects:
+                progress_manager.set_source_mobject(new_mobject.id, new_mobject)
             
+            # union by size, the surviving graph keeps whichever index dict is larger
             graph2_root_mobjects = graph2.root_mobjects.copy()
+            graph2_id_index = graph2.id_index
             graph2.root_mobjects = set()
-            graph1.root_mobjects = graph1.root_mobjects.union(graph2_root_mobjects)
+            graph1.root_mobjects.update(graph2_root_mobjects)
+            if len(graph2_id_index) > len(graph1.id_index):
+                graph2_id_index.update(graph1.id_index)
+                graph1.id_index = graph2_id_index
+            else:
+                graph1.id_index.update(graph2_id_index)
+
+            for root_mobject in graph2_root_mobjects:
+                root_mobject._graph = graph1
+
+            graph2.release()
 
         if child in graph1.root_mobjects:
             graph1.root_mobjects.remove(child) ###
+            child._graph = None
             #child.graph = None
         
         parent.children.add(child)
         child.parent = parent
+        graph1.bump_version()
 
         #for mobject in self.connected_from_root(child):
         #    mobject.tracked_graphs.append(lambda: self)
@@ -1514,50 +2131,61 @@ class DynamicMobjectGraph(Mobject):
 
         parent.children.remove(child)
         child.parent = None
+        self.unindex_mobjects(child)
+        self.bump_version()
 
-        graph = DynamicMobjectGraph()
+        graph = DynamicMobjectGraph(scene_manager=self.scene_manager)
         graph.root_mobjects = { child }
         #child.graph = graph
 
 
 class AutoDisconnectPacket():
 
+    __slots__ = ("current_parent", "next_parent", "child")
+
     def __init__(
         self,
         current_parent: MobjectIdentity,
         next_parent: MobjectIdentity,
-        child: MobjectIdentity,
-        child_clone: MobjectIdentity
+        child: MobjectIdentity
     ):
         self.current_parent = current_parent
         self.next_parent = next_parent
         self.child = child
-        self.child_clone = child_clone
 
     def extract(self):
-        return (self.current_parent, self.next_parent, self.child, self.child_clone)
+        return (self.current_parent, self.next_parent, self.child)
     
 
 class GraphEditManager():
 
     def __init__(
         self,
-        graph, 
-        primary_mobject: MobjectIdentity
+        graph
     ):
         self.graph = graph
-        self.primary_mobject = primary_mobject
         self.invalidation_lock = False
 
-        self.auto_disconnect_queue: List[AutoDisconnectPacket] = []
-        self.auto_disconnect_same_graph_parents: List[MobjectIdentity] = []
-
         self.composite_stack: List[MobjectIdentity] = []
         self.composite_queue: List[MobjectIdentity] = []
-        self.composite_depth: Dict[MobjectIdentity, int] = {}
+
+        # the worklist of process_composites(), kept on the manager so auto-disconnects can schedule into it mid-compose
+        self.worklist: List[Tuple[int, int, MobjectIdentity]] = []
+        self.pending: Set[MobjectIdentity] = set()
+        self.order = itertools.count()
+
+        # once a transaction is opened, end_edit() leaves the queue for end_transaction() to process
+        self.transaction_depth = 0
+
+        # how many execute_compose() calls this edit caused, total and per mobject
+        self.compose_count = 0
+        self.compose_counts: Dict[MobjectIdentity, int] = {}
 
     def finished(self):
-        return empty(self.composite_stack)
+        return empty(self.composite_stack) and not self.in_transaction()
+    
+    def in_transaction(self):
+        return self.transaction_depth > 0
 
     def begin_edit(self, mobject: MobjectIdentity):
         self.register_composite(mobject)
@@ -1566,83 +2194,119 @@ class GraphEditManager():
 
         back_mobject = self.composite_stack.pop()
 
-        if (back_mobject is not mobject) or (empty(self.composite_stack) and back_mobject is not self.primary_mobject):
+        if back_mobject is not mobject:
             raise Exception() # this should never happen
+        
+        if not empty(self.composite_stack):
+            return
+        
+        if self.in_transaction():
+            return
+
+        self.process_composites()
+
+    def begin_transaction(self):
+        self.transaction_depth += 1
+
+    def end_transaction(self):
 
-        if empty(self.composite_stack):
+        if not self.in_transaction():
+            raise Exception("end_transaction() called without a matching begin_transaction()")
+
+        self.transaction_depth -= 1
+
+        if not self.in_transaction() and empty(self.composite_stack):
             self.process_composites()
-            self.process_primary_mobject()
+
+    def abort_transaction(self):
+
+        if not self.in_transaction():
+            raise Exception("abort_transaction() called without a matching begin_transaction()")
+
+        self.transaction_depth -= 1
+
+        # the block raised, so its edits are dropped without a compose, an edit it raised inside of never reached end_edit()
+        if not self.in_transaction():
+            self.composite_stack = []
+            self.composite_queue = []
         
     def register_composite(self, mobject: MobjectIdentity):
         self.composite_stack.append(mobject)
         self.composite_queue.append(mobject)
-        self.composite_depth[mobject] = len(self.composite_stack)
 
-    def execute_invalidation(self, mobject: MobjectIdentity, propagate: bool, permit_auto_disconnects: bool):
+    def execute_invalidation(self, mobject: MobjectIdentity, permit_auto_disconnects: bool):
+        # an auto-disconnect can compose its old parent in the middle of another compose, so the lock is restored rather than cleared
+        invalidation_lock = self.invalidation_lock
         self.invalidation_lock = True
-        mobject.invalidate(propagate=propagate, permit_auto_disconnects=permit_auto_disconnects)
-        self.invalidation_lock = False
-
-    def sort_composite_queue(self):
-        return sorted(set(self.composite_queue), key=lambda mobject: self.composite_depth[mobject], reverse=True)
-    
-    def process_composites(self):
+        mobject.invalidate(permit_auto_disconnects=permit_auto_disconnects)
+        self.invalidation_lock = invalidation_lock
+        self.record_compose(mobject)
 
-        for mobject in self.sort_composite_queue():
-            if mobject is not self.primary_mobject:
+    def record_compose(self, mobject: MobjectIdentity):
+        self.compose_count += 1
+        self.compose_counts[mobject] = self.compose_counts.get(mobject, 0) + 1
 
-                self.execute_invalidation(mobject, propagate=False, permit_auto_disconnects=False)
+    def schedule(self, mobject: MobjectIdentity | None):
+        if mobject is None or mobject in self.pending:
+            return
+        self.pending.add(mobject)
+        heapq.heappush(self.worklist, (-mobject.depth(), next(self.order), mobject))
 
-                if len(self.auto_disconnect_queue) > 0:
-                    raise Exception("Auto-disconnect is not supported inside nested-level composite-edits")
-        
-    def process_primary_mobject(self):
-        self.execute_invalidation(self.primary_mobject, propagate=True, permit_auto_disconnects=True) # first invalidation-pass yields auto-disconnects
+    def process_composites(self):
 
-        
-        #if self.primary_mobject.current_dynamic_mobject.debug:
-        #    print("BEFORE -------------------------------------------------")
-        #    for cdm in [ mobject.current_dynamic_mobject for mobject in self.primary_mobject.children ]:
-        #        print("child structure: ", [ x.id for x in cdm.get_dynamic_family() ])
+        """
+        Every edited mobject is recomposed once, then its parent is scheduled, so an ancestor of several edited mobjects (or of an 
+        auto-disconnect's same-graph parent) composes once after all of them, instead of once per propagation.
+        The worklist is ordered by tree depth (deepest first). Auto-disconnects are resolved inside the compose that finds them, see auto_disconnect().
+        Scheduled ancestors that were not edited themselves compose with permit_auto_disconnects=False.
+        """
 
-        self.process_auto_disconnects()
+        self.worklist = []
+        self.pending = set()
+        edited: Set[MobjectIdentity] = set(self.composite_queue)
 
-        #if self.primary_mobject.current_dynamic_mobject.debug:
-        #    print("AFTER -------------------------------------------------")
-        #    for cdm in [ mobject.current_dynamic_mobject for mobject in self.primary_mobject.children ]:
-        #        print("child structure: ", [ x.id for x in cdm.get_dynamic_family() ])
+        for mobject in self.composite_queue:
+            self.schedule(mobject)
 
-    def queue_auto_disconnect(self, packet: AutoDisconnectPacket):
-        self.auto_disconnect_queue.append(packet)
+        while self.worklist:
+            (_, _, mobject) = heapq.heappop(self.worklist)
+            self.pending.remove(mobject)
 
-    def process_auto_disconnects(self):
+            if mobject.graph is not self.graph:
+                # detached from this graph during the edit (by a sibling compose or a cross-graph auto-disconnect), 
+                # so it is recomposed as a regular edit of the graph it now belongs to
+                dynamic_mobject = mobject.current_dynamic_mobject
+                dynamic_mobject.begin_edit()
+                dynamic_mobject.end_edit()
+                continue
 
-        for packet in self.auto_disconnect_queue:
-            self.process_auto_disconnect(packet) # may yiled same-graph-parent for invalidation 
-        
-        # could become same_graph after primary_mobject finishes render
-        # could become not same_graph after primary_mobject finishes render
-        for mobject in self.auto_disconnect_same_graph_parents:
-            self.execute_invalidation(mobject, propagate=True, permit_auto_disconnects=False)
+            self.execute_invalidation(mobject, permit_auto_disconnects=(mobject in edited))
+            self.schedule(mobject.parent)
 
-        self.execute_invalidation(self.primary_mobject, propagate=True, permit_auto_disconnects=False)
+        self.composite_queue = []
 
     def create_ref(self, x):
         return lambda: x
 
-    def process_auto_disconnect(self, packet: AutoDisconnectPacket):
-        
-        (current_parent, next_parent, child, child_clone) = packet.extract()
+    def auto_disconnect(self, packet: AutoDisconnectPacket) -> DynamicMobject:
 
-        #print((child.parent is not current_parent) , child_clone.parent is not next_parent, next_parent is not self.primary_mobject)
+        """
+        Called from next_parent's compose when it registers a child that still belongs to current_parent.
+        The child is detached from current_parent right away and returned, so next_parent registers the child itself and composes once.
+        current_parent takes child.clone() in its place, through change_parent_mobject:
+            - in another graph, replace() recomposes it as an edit of that graph
+            - an ancestor of next_parent (or already scheduled) picks the swap up from its own scheduled compose
+            - otherwise it is recomposed here, before next_parent renders, and its parent is scheduled
+        """
+        
+        (current_parent, next_parent, child) = packet.extract()
 
-        if (child.parent is not current_parent) or (child_clone.parent is not next_parent) or (next_parent is not self.primary_mobject):
+        if current_parent is None or next_parent is None or child is None:
             raise Exception()
 
-        if current_parent is None or next_parent is None or child is None or child_clone is None:
+        if child.parent is not current_parent:
             raise Exception()
 
-
         same_graph = False
         
         if current_parent.graph is self.graph:
@@ -1651,34 +2315,27 @@ class GraphEditManager():
 
             current_parent.change_parent_mobject = child
             current_parent.change_parent_mobject_replacement = clone_dynamic_mobject.identity
+            self.graph.disconnect_parent_child(current_parent, child)
 
-            self.execute_invalidation(current_parent, propagate=False, permit_auto_disconnects=False)
-            self.auto_disconnect_same_graph_parents.append(current_parent)
+            if current_parent not in self.pending and not MobjectIdentity.is_ancestor(current_parent, next_parent):
+                self.execute_invalidation(current_parent, permit_auto_disconnects=False)
+
+                # inside next_parent's subtree nothing above current_parent changes before next_parent renders
+                if not MobjectIdentity.is_ancestor(next_parent, current_parent):
+                    self.schedule(current_parent.parent)
         else:
             child_replacement = child.current_dynamic_mobject.clone()
             clone_dynamic_mobject = child_replacement
 
-          
             current_parent.current_dynamic_mobject.replace(child.current_dynamic_mobject, child_replacement)
 
-            if child.graph is current_parent.graph:
-                raise Exception()
-
-
-        if child.graph is current_parent.graph:
-            raise Exception()
-        
-        if child.graph is self.primary_mobject.graph:
-            raise Exception()
+            current_graph = current_parent.graph
+            if current_graph.manager().in_transaction():
+                # replace() was deferred by the other graph's transaction, detach now, the queued replace is applied when that transaction exits
+                current_graph.disconnect_parent_child(current_parent, child)
 
-        if child.graph is current_parent.graph or child.graph is self.primary_mobject.graph:
+        if child.graph is current_parent.graph or child.graph is next_parent.graph:
             raise Exception()
-        
-
-        self.primary_mobject.change_parent_mobject = child_clone
-        self.primary_mobject.change_parent_mobject_replacement = child.current_dynamic_mobject.identity
-        self.execute_invalidation(self.primary_mobject, propagate=False, permit_auto_disconnects=False)
-
 
         dynamic_mobject = child.current_dynamic_mobject
 
@@ -1693,19 +2350,20 @@ class GraphEditManager():
         mobject1 = clone_dynamic_mobject
         mobject2 = dynamic_mobject
 
+        # ids are unique within a component, so each clone mobject pairs with at most one original
+        family2: Dict[UUID, DynamicMobject] = { m2.id: m2 for m2 in mobject2.get_dynamic_family() }
         pairs = []
         
         for m1 in mobject1.get_dynamic_family():
-            for m2 in mobject2.get_dynamic_family():
-                if m1.source_id == m2.id:
-                    pairs.append((m1, m2))
+            m2 = family2.get(m1.source_id)
+            if m2 is not None:
+                pairs.append((m1, m2))
 
         for (m1, m2) in pairs:
             if same_graph:
                 continue
                 # SAME COMPONENT, CHILD AND NON-CHILD FORM 1
-                # tex.terms = [ m, A(m) ], where we has [ m.clone() defer queued AD, A(m) ]
-                #                                       [ m.clone() (continue)       A(m) ]
+                # tex.terms = [ m, A(m) ], where we has [ m, A(m.clone()) ], the clone keeps its own ids
 
             m1.reactive_lock = True
             m2.reactive_lock = True
@@ -1730,16 +2388,11 @@ class GraphEditManager():
             m2.reactive_lock = False
 
         # replace_source_mobject
+        scene_manager = self.graph.scene_manager
         for (m1, m2) in pairs:
-            zm1 = m1.identity
-            zm2 = m2.identity
-            
-            for graph_manager in SceneManager.scene_manager().graph_managers.values():
-                progress_manager = graph_manager.progress_manager
-                if progress_manager is not None:
-                    for idm, source_mobject in progress_manager.source_mobjects.items():
-                        if source_mobject is zm2:
-                            progress_manager.source_mobjects[idm] = zm1
+            scene_manager.replace_source_mobject(m2.identity, m1.identity)
+
+        return dynamic_mobject
 
         
         
@@ -1748,34 +2401,51 @@ class GraphEditManager():
 
 class MobjectIdentity():
 
+    # one per node and per clone/copy, so no instance __dict__
+    # next_children / next_family / next_from_auto_disconnect / permit_auto_disconnects are only set once the identity composes
+    __slots__ = (
+        "_id", "source_id", "target_id", "parent", "children", 
+        "_from_mobject", "_find_root", "_find_root_epoch", "_graph", 
+        "current", "mobject_center", 
+        "_change_parent_mobject", "_change_parent_mobject_replacement", "_replace_mobject", "_replace_mobject_replacement", 
+        "override_permit_auto_disconnects", "permit_auto_disconnects", 
+        "next_children", "next_family", "next_from_auto_disconnect", 
+        "__weakref__",
+    )
+
+    # shared by the identities of every scene, since a from_mobject chain does not know its scene, so bumps are taken under a lock
+    tracking_epoch: int = 0
+    tracking_epoch_lock = threading.Lock()
+
     def __init__(
         self, 
         mobject: DynamicMobject,
         construct_graph: bool
     ):
         super().__init__()
-        self.id = uuid.uuid4()
-        self.source_ids: List[UUID] = []
-        self.target_ids: List[UUID] = [] 
+        self._id = SceneManager.scene_manager().allocate_id()
+        self.source_id: UUID | None = None
+        self.target_id: UUID | None = None
         self.parent: MobjectIdentity | None = None
         self.children: Set[MobjectIdentity] = set()
 
-        self.tracked_graphs = []
-        self._tracked_mobjects = []
+        self._from_mobject: Callable[[], MobjectIdentity] | None = None
+        self._find_root: weakref.ref[MobjectIdentity] | None = None
+        self._find_root_epoch = -1
 
-        self.from_mobject: Callable[[], MobjectIdentity] | None = None
+        # only set on roots, a root keeps its graph alive, see __deepcopy__
+        self._graph: DynamicMobjectGraph | None = None
         
         if construct_graph:
             #self.mobject_graph: DynamicMobjectGraph | None = None
             #self.mobject_graph = DynamicMobjectGraph()
             mobject_graph = DynamicMobjectGraph()
             mobject_graph.root_mobjects = { self }
-            #self.tracked_graphs.append(lambda: mobject_graph)
 
             #self.mobject_graph.root_mobjects = { self }
 
         self.current: DynamicMobject | None = mobject
-        self.mobject_center = VMobject().get_center()
+        self.mobject_center = ORIGIN
 
         self._change_parent_mobject: MobjectIdentity | None = None
         self._change_parent_mobject_replacement: MobjectIdentity | None = None
@@ -1796,6 +2466,79 @@ class MobjectIdentity():
     def clear_tracking(self):
         self.from_mobject = None
 
+    def __deepcopy__(self, memo):
+
+        # the owning graph is never copied with an identity, the copy is made a root of whichever graph the caller constructs
+        # next_children / next_family / next_from_auto_disconnect are scratch from the last compose, and can reference identities outside the copied subtree
+        copy_identity = MobjectIdentity.__new__(MobjectIdentity)
+        memo[id(self)] = copy_identity
+
+        for key in MobjectIdentity.__slots__:
+            if key == "_graph":
+                copy_identity._graph = None
+            elif key in ("next_children", "next_family", "next_from_auto_disconnect", "__weakref__"):
+                continue
+            elif hasattr(self, key):
+                setattr(copy_identity, key, copy.deepcopy(getattr(self, key), memo))
+
+        return copy_identity
+
+    @property
+    def from_mobject(self) -> Callable[[], MobjectIdentity] | None:
+        return self._from_mobject
+    
+    @from_mobject.setter
+    def from_mobject(self, from_mobject: Callable[[], MobjectIdentity] | None):
+        self._from_mobject = from_mobject
+        with MobjectIdentity.tracking_epoch_lock:
+            MobjectIdentity.tracking_epoch += 1
+
+    def find_root(self) -> MobjectIdentity:
+
+        """
+        Follows from_mobject to the end of the chain, compressing the path as it goes.
+        A compressed path is only trusted until the next from_mobject assignment anywhere, since links are cleared after every transform.
+        """
+
+        # read once, a bump from another thread mid-walk then leaves the compressed path stale rather than wrongly current
+        epoch = MobjectIdentity.tracking_epoch
+        path: List[MobjectIdentity] = []
+        mobject = self
+
+        while True:
+            if mobject._find_root_epoch == epoch:
+                root = mobject._find_root()
+                if root is not None:
+                    break
+            if mobject._from_mobject is None:
+                root = mobject
+                break
+            path.append(mobject)
+            mobject = mobject._from_mobject()
+
+        for mobject in path:
+            mobject._find_root = weakref.ref(root)
+            mobject._find_root_epoch = epoch
+
+        return root
+
+    @property
+    def id(self) -> UUID:
+        return self._id
+    
+    @id.setter
+    def id(self, id: UUID):
+
+        try:
+            graph = self.graph
+        except:
+            # partially constructed, not yet the root of or connected to a graph
+            graph = None
+
+        if graph is not None:
+            graph.reindex_mobject(self, self._id, id)
+        self._id = id
+
     @property
     def change_parent_mobject(self):
         return self._change_parent_mobject
@@ -1817,14 +2560,7 @@ class MobjectIdentity():
         self._change_parent_mobject_replacement = mi
 
     def descendants(self) -> List[MobjectIdentity]:
-        descendants: List[MobjectIdentity] = []
-
-        def recursive_extract(mobject: MobjectIdentity):
-            descendants.append(mobject)
-            for child in mobject.children:
-                recursive_extract(child)
-
-        return descendants
+        return preorder(self, lambda mobject: mobject.children)
 
     @property
     def current_dynamic_mobject(self) -> DynamicMobject:
@@ -1838,20 +2574,27 @@ class MobjectIdentity():
    
     @property
     def root_parent(self) -> MobjectIdentity:
-        if self.parent is not None:
-            return self.parent.root_parent
-        else:
-            return self
+        mobject = self
+        while mobject.parent is not None:
+            mobject = mobject.parent
+        return mobject
     
     def is_root(self) -> bool:
         return self.root_parent is self
     
+    def depth(self) -> int:
+        depth = 0
+        mobject = self
+        while mobject.parent is not None:
+            depth += 1
+            mobject = mobject.parent
+        return depth
+    
     @property
     def graph(self) -> DynamicMobjectGraph:
 
         root_parent = self.root_parent #.mobject_graph
-        scene_manager = SceneManager.scene_manager()
-        graph = scene_manager.graph_of_root_mobject(root_parent)
+        graph = SceneManager.graph_of_root_mobject(root_parent)
         return graph
 
     """
@@ -1879,15 +2622,15 @@ class MobjectIdentity():
     def complete_child_registration(self):
         self.set_children(self.next_children)
 
-    def invalidate(self, propagate=True, permit_auto_disconnects=True):
+    def invalidate(self, permit_auto_disconnects=True):
         
-        # this is to handle tex1 = Tex(a); tex2 = Tex(a, a, a), where the 2nd and 3rd `a` need to return a clone without queing an auto-disconnect
-        # in this new 0.0.2 invalidation system, the 1st `a` return a.clone() while queueing an auto-disconnect, so `a` is not yet in next_children
-        # so we need the next_from_auto_disconnect to know that we need to return clones for the 2nd and 3rd `a`.
+        # this is to handle tex1 = Tex(a); tex2 = Tex(a, a, a), where the 2nd and 3rd `a` need to return a clone without a second auto-disconnect
+        # the 1st `a` is auto-disconnected and registered, next_from_auto_disconnect remembers it for the 2nd and 3rd `a`.
         self.next_from_auto_disconnect = set()
 
         self.permit_auto_disconnects = permit_auto_disconnects
         self.next_children: List[MobjectIdentity] = []
+        self.next_family: Set[MobjectIdentity] = set() # every identity in the subtrees of next_children, grown by register_child()
         self.current_dynamic_mobject.execute_compose()
 
         """
@@ -1898,14 +2641,14 @@ class MobjectIdentity():
         ManimMatrix.parent = Term and Term.superscript = ManimMatrix
         """
 
-        if propagate:
-            self.invalidate_parent()
-        
-    def invalidate_parent(self):
-        if self.parent is not None:
-            self.parent.invalidate(propagate=True, permit_auto_disconnects=False)
-        else:
-            pass
+    @staticmethod
+    def is_ancestor(ancestor: MobjectIdentity, mobject: MobjectIdentity) -> bool:
+        parent = mobject.parent
+        while parent is not None:
+            if parent is ancestor:
+                return True
+            parent = parent.parent
+        return False
 
     def pre_conditional_clone(self, mobject: DynamicMobject) -> DynamicMobject:
         
@@ -1924,14 +2667,21 @@ class MobjectIdentity():
     
     def conditional_clone(self, mobject: DynamicMobject) -> DynamicMobject:
 
-        if mobject.identity in self.next_children or mobject.identity in self.next_from_auto_disconnect:
+        # checked first, an auto-disconnect has already moved the child under its next parent, so it would look like it has another parent
+        if mobject.identity is self.change_parent_mobject:
+            replacement = self.change_parent_mobject_replacement.current_dynamic_mobject
+            self.change_parent_mobject = None
+            self.change_parent_mobject_replacement = None
+            return replacement
+
+        if mobject.identity in self.next_from_auto_disconnect:
             return mobject.clone()
 
+        # covers both a repeated child and
         # SAME COMPONENT, CHILD AND NON-CHILD FORM 2 
         # tex.terms = [ A(m), m ]
-        for identity in self.next_children:
-            if mobject.identity in [ cdm.identity for cdm in identity.current_dynamic_mobject.get_dynamic_family() ]:
-                return mobject.clone()
+        if mobject.identity in self.next_family:
+            return mobject.clone()
             
         if mobject.identity is self:
             return mobject.clone()
@@ -1950,19 +2700,9 @@ class MobjectIdentity():
                 print(self.override_permit_auto_disconnects)
                 raise Exception(f"Inval {self.current_dynamic_mobject}-{self.id},  {mobject}-{mobject.id} has parent {mobject.parent}-{mobject.parent.id}")
 
-            clone = mobject.clone()
-            
-            self.graph.manager().state.edit_manager.queue_auto_disconnect(
-                AutoDisconnectPacket(current_parent=mobject.identity.parent, next_parent=self, child=mobject.identity, child_clone=clone.identity)
+            return self.graph.manager().state.edit_manager.auto_disconnect(
+                AutoDisconnectPacket(current_parent=mobject.identity.parent, next_parent=self, child=mobject.identity)
             )
-            return clone
-        
-        if mobject.identity is self.change_parent_mobject:
-            replacement = self.change_parent_mobject_replacement.current_dynamic_mobject
-            self.change_parent_mobject = None
-            self.change_parent_mobject_replacement = None
-            return replacement
-
         
         return mobject
 
@@ -1972,6 +2712,7 @@ class MobjectIdentity():
             mobject = self.pre_conditional_clone(mobject)
             mobject = self.conditional_clone(mobject)
             self.next_children.append(mobject.identity)
+            self.next_family.update(preorder(mobject.identity, lambda identity: identity.children))
             mobject = mobject.identity.current_dynamic_mobject
         
         return mobject
@@ -2083,7 +2824,7 @@ class DynamicMobject(VMobject):
         self.shift_flag = False
         self.scale_flag = False
         self.scale_factor = scale_factor
-        self.position_factor = VMobject().get_center()
+        self.position_factor = ORIGIN
 
         self._save_x: float | None = None
         self._save_y: float | None = None
@@ -2217,6 +2958,18 @@ class DynamicMobject(VMobject):
         self.manager().end_edit(self.identity)
 
 
+    def batch(self):
+
+        """
+        with tex.batch():
+            tex[0] = "a"
+            tex[2] = "b"
+
+        recomposes tex once on exit instead of once per edit, see DynamicMobjectGraph.transaction()
+        """
+
+        return self.graph.transaction()
+
     def invalidate(self) -> Self:
 
         raise Exception(
@@ -2284,18 +3037,22 @@ class DynamicMobject(VMobject):
     def merge(self, other: DynamicMobject):
 
         def extract_direct_dynamic_mobjects(dm, arr):
-            for subm in dm.submobjects:
 
+            def children(subm):
+                if subm is dm:
+                    return subm.submobjects
                 is_dm = isinstance(subm, DynamicMobject)
                 is_mt = hasattr(subm, "math_tex_flag")
+                return [] if (is_dm and not is_mt) else subm.submobjects
 
-                if is_dm and not is_mt:
+            for subm in preorder(dm, children)[1:]:
+                if isinstance(subm, DynamicMobject) and not hasattr(subm, "math_tex_flag"):
                     arr.append(subm)
-                else:
-                    extract_direct_dynamic_mobjects(subm, arr)
             return arr
 
-        def recursive_extract(dm1, dm2):
+        pairs = [ (self, other) ]
+        while pairs:
+            (dm1, dm2) = pairs.pop()
             dm2.target_id = dm1.id
 
             direct1 = extract_direct_dynamic_mobjects(dm1, [])
@@ -2312,10 +3069,7 @@ class DynamicMobject(VMobject):
             if len(direct1) != len(direct2):
                 raise Exception(" requires both mobjects to have same tree-structure")
 
-            for s1, s2 in zip(direct1, direct2):
-                recursive_extract(s1, s2)
-
-        recursive_extract(self, other)
+            pairs.extend(reversed(list(zip(direct1, direct2))))
     """
     def merge_structure(self, other: DynamicMobject):
 
@@ -2382,20 +3136,21 @@ class DynamicMobject(VMobject):
         return DynamicMobjectSubgraph.from_dynamic_mobject(self)
 
     def direct_submobjects(self) -> Mobject:
-        
-        def recursive_extract(mobject: Mobject, group: Mobject):
 
+        group = VGroup()
+        stack = [ (self, group) ]
+
+        while stack:
+            (mobject, mobject_group) = stack.pop()
             for submobject in mobject.submobjects:
                 if not isinstance(submobject, DynamicMobject):
                     if submobject.has_points():
-                        group.add(submobject)
+                        mobject_group.add(submobject)
                     else:
                         subgroup = VGroup()
-                        recursive_extract(submobject, subgroup)
-                        group.add(subgroup)
+                        mobject_group.add(subgroup)
+                        stack.append((submobject, subgroup))
 
-        group = VGroup()
-        recursive_extract(self, group)
         return group
 
     def get_point_dynamic_mobject(self):
@@ -2405,35 +3160,32 @@ class DynamicMobject(VMobject):
 
         def convert_to_point_mobject(mobject: Mobject):
 
-            def recursive_extract(mobject: Mobject, group):
+            group = VGroup()
+            stack = [ (mobject, group) ]
 
+            while stack:
+                (mobject, mobject_group) = stack.pop()
                 for submobject in mobject.submobjects:
                     if submobject.has_points():
                         point_mobject = submobject.get_point_mobject()
-                        group.add(point_mobject)
+                        mobject_group.add(point_mobject)
                     else:
                         subgroup = VGroup()
-                        recursive_extract(submobject, subgroup)
-                        group.add(subgroup)
+                        mobject_group.add(subgroup)
+                        stack.append((submobject, subgroup))
 
-            group = VGroup()
-            recursive_extract(mobject, group)
             return group
 
-        def recursive_extract(mobject: DynamicMobject) -> DynamicMobject:
-
+        stack = [ mobject_copy ]
+        while stack:
+            mobject = stack.pop()
             direct = convert_to_point_mobject(mobject.direct_submobjects())
 
             mobject = mobject.become(
                 DGroup(direct, *mobject.children)
             )
 
-            for child in mobject.children:
-                recursive_extract(child)
-
-            return mobject
-
-        mobject_copy = recursive_extract(mobject_copy)
+            stack.extend(reversed(mobject.children))
 
         restore_submobjects = {}
 
@@ -2462,7 +3214,9 @@ class DynamicMobject(VMobject):
 
         parent = self.mobject_identity.parent
         self.mobject_identity.parent = None
-        copy_mobject = copy.deepcopy(self, memo={ "override": True })
+        override_memo = { "override": True }
+        seed_bulk_buffers([ self ], override_memo)
+        copy_mobject = copy.deepcopy(self, memo=override_memo)
         self.mobject_identity.parent = parent
 
         copy_graph = DynamicMobjectGraph()
@@ -2471,25 +3225,41 @@ class DynamicMobject(VMobject):
         
     def clone(self) -> DynamicMobject:
         copy_mobject = self.copy()
+        scene_manager = copy_mobject.identity.graph.scene_manager
 
         for mobject in copy_mobject.get_dynamic_family():
             mobject.reactive_lock = True
             mobject.source_id = mobject.id
             mobject.reactive_lock = False
-            mobject.id = uuid.uuid4()
+            mobject.id = scene_manager.allocate_id()
 
         return copy_mobject
 
     def get_dynamic_family(self) -> List[DynamicMobject]:
-        family: Set[DynamicMobject] = set()
+        family: Set[DynamicMobject] = set(preorder(self, lambda mobject: mobject.children))
+        return list(family)
 
-        def recursive_extract(mobject: DynamicMobject):
-            family.add(mobject)
-            for child in mobject.children:
-                recursive_extract(child)
+    def get_family(self, recurse: bool = True) -> List[Mobject]:
 
-        recursive_extract(self)
-        return list(family)
+        """
+        Mobject.get_family() without the recursion. manim's version recurses once per level, and copies the family of each submobject into its parent's,
+        so on a deep graph it hits the recursion limit and costs depth^2 per call, on every move_to() / shift() of a compose.
+        Same order as manim's: pre-order, keeping the last occurrence of a mobject that appears more than once.
+        Submobjects that override get_family() themselves contribute their own family.
+        """
+
+        family: List[Mobject] = []
+        stack: List[Mobject] = [ self ]
+
+        while stack:
+            mobject = stack.pop()
+            if mobject is not self and type(mobject).get_family not in (Mobject.get_family, DynamicMobject.get_family):
+                family.extend(mobject.get_family())
+                continue
+            family.append(mobject)
+            stack.extend(reversed(mobject.submobjects))
+
+        return remove_list_redundancies(family)
     
     def shift(self, *vectors) -> Self:
 
@@ -2614,27 +3384,21 @@ class DynamicMobject(VMobject):
 
     @property
     def source_id(self) -> UUID | None:
-        if not self.identity.source_ids:
-            return None
-        
-        return self.identity.source_ids[-1]
+        return self.identity.source_id
     
     @source_id.setter
     @reactive
     def source_id(self, id: UUID):
-        self.identity.source_ids.append(id)
+        self.identity.source_id = id
 
     @property
     def target_id(self) -> UUID | None:
-        if not self.identity.target_ids:
-            return None
-        
-        return self.identity.target_ids[-1]
+        return self.identity.target_id
     
     @target_id.setter
     @reactive
     def target_id(self, id: UUID):
-        self.identity.target_ids.append(id)
+        self.identity.target_id = id
 
     @property
     def graph(self) -> DynamicMobjectGraph:
@@ -2697,17 +3461,19 @@ class DGroup(DynamicMobject):
     def compose(self):
         self.dynamic_mobjects: Set[DynamicMobject] = set()
 
-        def recursive_extract(mobject):
-            for submobject in mobject.submobjects.copy():
+        def children(mobject):
+            return [ submobject for submobject in mobject.submobjects if not isinstance(submobject, DynamicMobject) ]
+        
+        group = VGroup(*self._mobjects)
+
+        # post-order, so children are registered in the same order as the former recursive version
+        for mobject in postorder(group, children):
+            for submobject in mobject.submobjects:
                 if isinstance(submobject, DynamicMobject):
                     self.dynamic_mobjects.add(submobject)
-                else:
-                    recursive_extract(submobject)
             
             mobject.submobjects = [ self.register_child(submobject) for submobject in mobject.submobjects ]
         
-        group = VGroup(*self._mobjects)
-        recursive_extract(group)
         self._mobjects = group.submobjects
         self.submobjects = group.submobjects
     
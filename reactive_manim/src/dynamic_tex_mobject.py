@@ -1,8 +1,17 @@
 from __future__ import annotations
 from abc import abstractmethod
 from typing_extensions import *
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from collections import OrderedDict
+from pathlib import Path
+import functools
+import hashlib
+import atexit
+import json
 import math
+import os
+import tempfile
+import threading
 
 import manim
 from manim import *
@@ -11,6 +20,292 @@ from .numpy_mobject_array import NumpyMobjectArray, map_2d
 
 config.tex_template.add_to_preamble("\\let\\originalleft\\left \\let\\originalright\\right \\renewcommand{\\left}{\\mathopen{}\\mathclose\\bgroup\\originalleft} \\renewcommand{\\right}{\\aftergroup\\egroup\\originalright}")
 
+
+def mobject_nbytes(mobject: Mobject) -> int:
+    nbytes = 0
+    for submobject in mobject.get_family():
+        for value in submobject.__dict__.values():
+            if isinstance(value, np.ndarray):
+                nbytes += value.nbytes
+    return nbytes
+
+
+class SingleStringMathTexCache():
+
+    """
+    LRU cache of parsed SingleStringMathTex mobjects, keyed by (tex_string, tex_template),
+
+    Every execute_compose() of a root encodable renders its full tex_string,
+    progress transforms that flip between equation states render the same tex_strings repeatedly.
+    manim caches the compiled svg on disk, but re-parsing the svg into glyph mobjects is still expensive,
+    so we keep the parsed glyphs in memory and hand out copies.
+
+    The cache is bounded by both entry count and bytes of point/color data held.
+    One cache serves every scene in the process, so entries are only touched under self.lock, 
+    the LaTeX render itself runs outside of it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_bytes: int = 64 * 1024 * 1024
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[Tuple[str, str], Tuple[SingleStringMathTex, int]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(tex_string: str) -> Tuple[str, str]:
+        return (tex_string, config.tex_template.body)
+
+    def render(self, tex_string: str) -> SingleStringMathTex:
+
+        key = self.key(tex_string)
+
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                mobject, _ = self.entries[key]
+                return mobject.copy()
+            self.misses += 1
+
+        mobject = SingleStringMathTex(tex_string)
+        nbytes = mobject_nbytes(mobject)
+        glyph_count_index.record(tex_string, len(mobject))
+
+        with self.lock:
+            # another scene may have rendered the same key meanwhile
+            if key not in self.entries and nbytes <= self.max_bytes and self.max_entries > 0:
+                self.entries[key] = (mobject, nbytes)
+                self.bytes += nbytes
+                self.evict()
+
+        return mobject.copy()
+
+    def evict(self):
+        # callers hold self.lock
+        while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.bytes -= nbytes
+            self.evictions += 1
+
+    def resize(self, max_entries: int | None = None, max_bytes: int | None = None):
+        with self.lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self.evict()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+tex_render_cache = SingleStringMathTexCache()
+
+def render_single_string_math_tex(tex_string: str) -> SingleStringMathTex:
+    return tex_render_cache.render(tex_string)
+
+
+@functools.lru_cache(maxsize=8)
+def tex_template_hash(body: str) -> str:
+    # glyph counts also depend on manim's svg parsing, so the manim version is part of the key
+    return hashlib.sha256(f"{manim.__version__}\n{body}".encode("utf-8")).hexdigest()[:16]
+
+
+class GlyphCountIndex():
+
+    """
+    Persistent tex_string -> glyph-count index, stored next to manim's Tex cache.
+
+    MathString.accept_mobject_from_rendered_tex_string() only needs to know how many glyphs its tex_string renders to,
+    in order to slice its portion out of the root's rendered SingleStringMathTex. 
+    The index is populated by every render done by SingleStringMathTexCache, and read back on later runs, 
+    so slicing does not require another LaTeX invocation per leaf.
+    On a cold index, prefetch() counts the missing leaves of a root from one render per batch of leaves, rather than one render per leaf.
+
+    Counts depend on the tex template, so entries are grouped by a hash of the template body and manim version.
+    Like the render cache, one index serves every scene in the process, so self.counts is only touched under self.lock.
+    """
+
+    filename = "reactive_manim_glyph_counts.json"
+
+    def __init__(self):
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self.loaded = False
+        self.dirty = False
+
+        self.lock = threading.Lock()
+
+    def path(self) -> Path | None:
+        try:
+            return Path(config.get_dir("tex_dir")) / self.filename
+        except Exception:
+            return None
+        
+    def read(self) -> Dict[str, Dict[str, int]]:
+        path = self.path()
+        if path is None or not path.exists():
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self):
+        # callers hold self.lock
+        for template_hash, counts in self.read().items():
+            self.counts.setdefault(template_hash, {}).update(counts)
+        self.loaded = True
+
+    def save(self):
+        path = self.path()
+        if path is None:
+            return
+        
+        with self.lock:
+            if not self.dirty:
+                return
+            snapshot = { template_hash: dict(template_counts) for template_hash, template_counts in self.counts.items() }
+            self.dirty = False
+
+        # merge with entries written by other processes since load()
+        counts = self.read()
+        for template_hash, template_counts in snapshot.items():
+            counts.setdefault(template_hash, {}).update(template_counts)
+
+        # a temp file of our own, so processes saving at once never write into each other's file before the rename
+        temp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, prefix=path.name, suffix=".tmp", delete=False) as file:
+                temp_name = file.name
+                json.dump(counts, file)
+            os.replace(temp_name, path)
+        except OSError:
+            if temp_name is not None and os.path.exists(temp_name):
+                os.remove(temp_name)
+            with self.lock:
+                self.dirty = True
+
+    def template_counts(self) -> Dict[str, int]:
+        # callers hold self.lock
+        if not self.loaded:
+            self.load()
+        return self.counts.setdefault(tex_template_hash(config.tex_template.body), {})
+
+    def record(self, tex_string: str, count: int):
+        with self.lock:
+            counts = self.template_counts()
+            if counts.get(tex_string) != count:
+                counts[tex_string] = count
+                self.dirty = True
+
+    def lookup(self, tex_string: str) -> int | None:
+        with self.lock:
+            return self.template_counts().get(tex_string)
+
+    def count(self, tex_string: str) -> int:
+        count = self.lookup(tex_string)
+        if count is None:
+            count = len(render_single_string_math_tex(tex_string))
+            self.record(tex_string, count)
+        return count
+
+    # leaves are batched with this much space between them, far wider than any gap inside a leaf
+    separator_em = 30
+
+    # at most this many leaves per render, 31 gaps of 30em are about 9300pt at 10pt, well within TeX's \maxdimen (16383.99pt)
+    batch_size = 32
+
+    def prefetch(self, tex_strings: List[str]):
+
+        """
+        Counts every tex_string missing from the index from one render per batch_size strings, where the strings are laid out on one line, 
+        separated by \\hspace{separator_em em}, and the glyphs are split wherever the gap to the next glyph is that wide.
+        If the split of a batch does not come out as one non-empty run per string (a leaf renders no glyphs, spans lines, or the batch does not compile), 
+        nothing is recorded for that batch and count() renders each of its leaves on its own, as before.
+        """
+
+        with self.lock:
+            counts = self.template_counts()
+            missing = list(dict.fromkeys(tex_string for tex_string in tex_strings if tex_string not in counts))
+
+        for i in range(0, len(missing), self.batch_size):
+            self.prefetch_batch(missing[i:i + self.batch_size])
+
+    def prefetch_batch(self, batch: List[str]):
+
+        # a single leaf gains nothing from batching, and its own render also fills the render cache
+        if len(batch) < 2:
+            return
+        
+        separator = f" \\hspace{{{self.separator_em}em}} "
+        try:
+            # not through the render cache, the batch string is never rendered again
+            mobject = SingleStringMathTex(separator.join(batch))
+        except Exception:
+            return
+        
+        runs = self.split_runs(mobject.submobjects)
+        if runs is None or len(runs) != len(batch):
+            return
+        
+        for (tex_string, count) in zip(batch, runs):
+            self.record(tex_string, count)
+
+    def split_runs(self, glyphs: List[VMobject]) -> List[int] | None:
+
+        if not glyphs:
+            return None
+
+        widths = sorted(glyph.width for glyph in glyphs if glyph.width > 0)
+        if not widths:
+            return None
+        
+        # the median glyph is about half an em wide, so this threshold sits near 5em, 
+        # above any spacing command inside a leaf (\qquad is 2em) and well below separator_em
+        threshold = 10 * widths[len(widths) // 2]
+
+        runs = [ 1 ]
+        right = glyphs[0].get_right()[0]
+
+        # glyphs are in tex order, which can step back left inside a leaf (a fraction's denominator), so the gap is taken from the rightmost edge so far
+        for glyph in glyphs[1:]:
+            if glyph.get_left()[0] - right > threshold:
+                runs.append(1)
+            else:
+                runs[-1] += 1
+            right = max(right, glyph.get_right()[0])
+        
+        return runs
+
+glyph_count_index = GlyphCountIndex()
+atexit.register(glyph_count_index.save)
+
+
 def pairwise(iterable):
     
     iterator = iter(iterable)
@@ -61,13 +356,18 @@ class MathEncodable(DynamicMobject):
         else:
             self.tex_string = math_encoding
 
-        if self.parent and isinstance(self.parent, MathEncodable):# and not self.parent.adapter:
+        if isinstance(self.parent, MathEncodable):# and not self.parent.adapter:
             # ManimMatrix uses an MobjectMatrix to position math components, 
             # The scale of the math components is determined by the ManimMatrix's scaling factor, and not superscript level. 
             # We do not use component.accept_mobject(...) to inject latex submobjects into the component, since we disregard prior superscript context.
             # Therefore, we must render as if the component were the root, however, it can still pull render_tex_string() from the root context. 
             pass
         else:
+            glyph_count_index.prefetch([ 
+                mobject.tex_string for mobject in self.get_dynamic_family() 
+                if isinstance(mobject, MathString) and not isinstance(mobject, HSpaceTex) 
+            ])
+
             math_tex = self.render_tex_string(self.tex_string)
             math_tex.scale(self.scale_factor)
 
@@ -102,7 +402,7 @@ class MathEncodable(DynamicMobject):
         if self.math_encodable_init and self.math_encodable_init_color is not None and False:
             return SingleStringMathTex(tex_string, color=self.math_encodable_init_color)
         else:
-            return SingleStringMathTex(tex_string)
+            return render_single_string_math_tex(tex_string)
 
     def __str__(self) -> str:
         if self.tex_string is None:
@@ -145,7 +445,7 @@ class MathComponent(MathEncodable):
             return term
         
         if isinstance(term, (str, int, float)):
-            return MathString(str(term))
+            return MathString(str(term), lazy=True)
         
         if isinstance(term, List):
             return MathTex(*term) 
@@ -344,15 +644,41 @@ class MathTex(MathComponent):
 
 class MathString(MathEncodable):
 
-    def __init__(self, tex_string: str, **kwargs):
+    def __init__(self, tex_string: str, lazy: bool = False, **kwargs):
         self.tex_string = tex_string
         self.store_sm_count = 8
-        
-        mobject = SingleStringMathTex(tex_string)
-        self.submobject_group = mobject
-        self.submobjects = mobject.submobjects
+
+        # A lazy MathString holds only its tex_string until it is adopted by a parent, which distributes its rendered glyphs,
+        # or until it is realized standalone. MathComponent.adapt_input() creates lazy MathStrings, 
+        # since they are always adopted by the component that adapted them.
+        self.lazy = lazy
+
+        if self.lazy:
+            self.submobject_group = None
+        else:
+            mobject = render_single_string_math_tex(tex_string)
+            self.submobject_group = mobject
+            self.submobjects = mobject.submobjects
         super().__init__(**kwargs)
 
+    def execute_compose(self):
+
+        if self.lazy and self.parent is None:
+            self.tex_string = self.compose_tex_string()
+            self.identity.complete_child_registration()
+            return
+        
+        super().execute_compose()
+
+    def realize(self) -> Self:
+
+        if self.lazy and not self.super_init:
+            self.lazy = False
+            self.begin_edit()
+            self.end_edit()
+
+        return self
+
     def compose_tex_string(self) -> str:
         return self.tex_string
     
@@ -368,19 +694,21 @@ class MathString(MathEncodable):
         #    raise Exception("zero on ", self.tex_string)
 
 
-        submobject_count = len(SingleStringMathTex(self.tex_string))
+        submobject_count = glyph_count_index.count(self.tex_string)
         #self.store_sm_count = submobject_count
         submobjects = mobject.submobjects[:submobject_count]
 
         #if self.id == "Y":
         #    AR.append(VGroup(*submobjects).copy())
 
-        if False:
-            # don't match style
-            pass
+        if self.submobject_group is None:
+            # first render of a lazy MathString, there is no prior style to match
+            self.submobject_group = VGroup(*submobjects)
         else:
             self.submobject_group = VGroup(*submobjects).match_style(self.submobject_group)
 
+        self.lazy = False
+
         self.submobjects =  [ *submobjects ]
 
         #if self.id == "Y":
@@ -388,8 +716,27 @@ class MathString(MathEncodable):
 
         return submobject_count
 
+    def set_color(self, *args, **kwargs) -> Self:
+        self.realize()
+        return super().set_color(*args, **kwargs)
+    
+    def set_fill(self, *args, **kwargs) -> Self:
+        self.realize()
+        return super().set_fill(*args, **kwargs)
+    
+    def set_stroke(self, *args, **kwargs) -> Self:
+        self.realize()
+        return super().set_stroke(*args, **kwargs)
+
     def __repr__(self):
         return f"MathString({self.id, self.tex_string})"
+    
+    def __bool__(self) -> bool:
+        # a lazy MathString has no submobjects until its parent hands it glyphs, so Mobject.__len__ would make it falsy, 
+        # components test terms with `if term:`, so it answers as its rendered self would
+        if self.lazy:
+            return self.tex_string != ""
+        return len(self) > 0
 
 class MathStringFragment(MathEncodable):
 
@@ -402,7 +749,7 @@ class MathStringFragment(MathEncodable):
 
     def execute_compose(self):
 
-        if self.parent:
+        if self.parent is not None:
             super().execute_compose()
 
     def compose_tex_string(self):
@@ -427,10 +774,17 @@ class MathStringFragment(MathEncodable):
 class HSpaceTex(MathString):
 
     def __init__(self, buff):
+        self.buff = buff
         if isinstance(buff, (float, int)):
-            super().__init__(f"\\hspace{{{buff}em}}")
+            super().__init__(f"\\hspace{{{buff}em}}", lazy=True)
         else:
-            super().__init__(f"\\hspace{{{buff}}}")
+            super().__init__(f"\\hspace{{{buff}}}", lazy=True)
+
+    def accept_mobject_from_rendered_tex_string(self, mobject: VMobject) -> int:
+        # \hspace renders no glyphs, so the spacer never needs its own render to count them
+        self.lazy = False
+        self.submobjects = []
+        return 0
 
 
 class MathSequence(MathComponent):
@@ -448,33 +802,38 @@ class MathSequence(MathComponent):
         self.commas = []
         if self.include_commas:
             for _ in range(1, len(self.sequence_terms)):
-                self.commas.append(MathString(","))
+                self.commas.append(MathString(",", lazy=True))
+
+        # spacers are not children, they are reused across composes instead of being reconstructed for every gap
+        self.spacers: List[HSpaceTex] = []
 
         super().__init__()
 
+    @staticmethod
+    def reuse_spacers(spacers: List[HSpaceTex], count: int, buff) -> List[HSpaceTex]:
+        spacers = [ spacer for spacer in spacers[:count] if spacer.buff == buff ]
+        while len(spacers) < count:
+            spacers.append(HSpaceTex(buff))
+        return spacers
+
     def compose_tex_string(self):
 
         self.sequence_terms = [ self.register_child(term) for term in self.sequence_terms ]
         self.commas = [ self.register_child(comma) for comma in self.commas ]
-        spacers = []
+        self.spacers = self.reuse_spacers(self.spacers, max(len(self.sequence_terms) - 1, 0), self.extra_buff)
 
         components = []
         if self.include_commas:
             if self.sequence_terms:
                 components.append(self.sequence_terms[0])
-            for comma, term in zip(self.commas, self.sequence_terms[1:]):
-                x = HSpaceTex(self.extra_buff)
-                components += [ comma, x, term ]
-                spacers += [x]
+            for comma, spacer, term in zip(self.commas, self.spacers, self.sequence_terms[1:]):
+                components += [ comma, spacer, term ]
         else:
             if self.sequence_terms:
                 components.append(self.sequence_terms[0])
-            for term in self.sequence_terms[1:]:
-                x = HSpaceTex(self.extra_buff)
-                components += [ x, term ]
-                spacers += [x]
+            for spacer, term in zip(self.spacers, self.sequence_terms[1:]):
+                components += [ spacer, term ]
         
-        self.spacers = spacers
         return components
 
     def adapt_terms(self, terms):
@@ -508,7 +867,7 @@ class MathSequence(MathComponent):
         term = self.adapt_input(term)
 
         if self.sequence_terms:
-            self.commas.insert(index, MathString(","))
+            self.commas.insert(index, MathString(",", lazy=True))
 
         self.sequence_terms.insert(index, term)
 
@@ -540,10 +899,11 @@ class MathList(MathSequence):
         bracket_l = "[",
         bracket_r = "]"
     ):
-        self.bracket_l = MathString(bracket_l)
-        self.bracket_r = MathString(bracket_r)
+        self.bracket_l = MathString(bracket_l, lazy=True)
+        self.bracket_r = MathString(bracket_r, lazy=True)
         self.extra_inner_buff = extra_inner_buff
         self.extra_outer_buff = extra_outer_buff
+        self.outer_spacers: List[HSpaceTex] = []
         
         super().__init__(*sequence_terms, include_commas=include_commas, extra_buff=extra_inner_buff)
 
@@ -551,32 +911,28 @@ class MathList(MathSequence):
 
         self.sequence_terms = [ self.register_child(term) for term in self.sequence_terms ]
         self.commas = [ self.register_child(comma) for comma in self.commas ]
-        spacers = []
+        self.spacers = self.reuse_spacers(self.spacers, max(len(self.sequence_terms) - 1, 0), self.extra_inner_buff)
+        self.outer_spacers = self.reuse_spacers(self.outer_spacers, 2, self.extra_outer_buff)
 
         self.bracket_l = self.register_child(self.bracket_l)
         self.bracket_r = self.register_child(self.bracket_r)
         
         components = []
         components.append(self.bracket_l)
-        components.append(HSpaceTex(self.extra_outer_buff))
+        components.append(self.outer_spacers[0])
         if self.include_commas:
             if self.sequence_terms:
                 components.append(self.sequence_terms[0])
-            for comma, term in zip(self.commas, self.sequence_terms[1:]):
-                x = HSpaceTex(self.extra_inner_buff)
-                components += [ comma, x, term ]
-                spacers += [x]
+            for comma, spacer, term in zip(self.commas, self.spacers, self.sequence_terms[1:]):
+                components += [ comma, spacer, term ]
         else:
             if self.sequence_terms:
                 components.append(self.sequence_terms[0])
-            for term in self.sequence_terms[1:]:
-                x = HSpaceTex(self.extra_inner_buff)
-                components += [ x, term ]
-                spacers += [x]
+            for spacer, term in zip(self.spacers, self.sequence_terms[1:]):
+                components += [ spacer, term ]
         
-        components.append(HSpaceTex(self.extra_outer_buff))
+        components.append(self.outer_spacers[1])
         components.append(self.bracket_r)
-        self.spacers = spacers
         return components
 
 
@@ -748,7 +1104,7 @@ class Term(MathComponent):
     def remove(self, mobject):
 
         if mobject is self.term:
-            self._term = MathString("")
+            self._term = MathString("", lazy=True)
 
         if mobject is self._superscript:
             self._superscript = None
@@ -1331,7 +1687,7 @@ class MathMatrix(MathComponent):
             encoding = []
             front_mobject, *next_mobjects = mobject_row
 
-            if front_mobject:
+            if front_mobject is not None:
                 encoding += [ front_mobject ]
 
             for mobject in next_mobjects:
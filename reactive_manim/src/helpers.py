@@ -1,4 +1,4 @@
-from typing import Iterable, TypeVar, Optional, Callable
+from typing import Iterable, TypeVar, Optional, Callable, List
 T = TypeVar("T")
 
 def extract_unique(iterable: Iterable[T]) -> T:
@@ -27,10 +27,6 @@ def set_none(function):
 import uuid
 
 
-v4 = uuid.uuid4
-# Initialize a counter
-counter = -1
-
 graph_counter = -1
 
 def create_graph_id():
@@ -42,22 +38,6 @@ def create_graph_id():
     
     return graph_counter
 
-# Define the custom function that replaces uuid.uuid4()
-def custom_uuid4x():
-    global counter
-    counter += 1
-
-    #if counter == 111:
-    #    raise Exception()
-    
-    return counter
-
-def custom_uuid4():
-    return v4()
-
-# Overwrite uuid.uuid4() with your custom function
-uuid.uuid4 = custom_uuid4x
-
 
 def none(object: Optional[T]):
     return True if object is None else False
@@ -65,3 +45,34 @@ def none(object: Optional[T]):
 def empty(iterable: Iterable[T]):
     return len(iterable) == 0
 
+
+# explicit-stack traversals, so a deep tree (continued fractions, Term towers) is not bounded by the recursion limit
+
+def preorder(root: T, children: Callable[[T], Iterable[T]]) -> List[T]:
+    # root, then each child subtree in order
+    nodes: List[T] = []
+    stack = [ root ]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(reversed(list(children(node))))
+    return nodes
+
+def postorder(root: T, children: Callable[[T], Iterable[T]]) -> List[T]:
+    # each child subtree in order, then the node
+    nodes: List[T] = []
+    stack = [ root ]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(children(node))
+    nodes.reverse()
+    return nodes
+
+def ancestors(node: T, parent: Callable[[T], Optional[T]]) -> List[T]:
+    # node, its parent, ..., up to the root
+    nodes: List[T] = []
+    while node is not None:
+        nodes.append(node)
+        node = parent(node)
+    return nodes
@@ -0,0 +1,16 @@
+import importlib.util
+
+import pytest
+
+# the suite renders LaTeX through manim, without it there is nothing to collect
+if importlib.util.find_spec("manim") is None:
+    collect_ignore_glob = [ "test_*.py" ]
+else:
+    from manim import Scene
+
+    @pytest.fixture
+    def scene():
+        # Scene.__init__ attaches a SceneManager, activate() makes it the current one for the test body
+        scene = Scene()
+        with scene.scene_manager.activate():
+            yield scene
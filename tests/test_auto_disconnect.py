@@ -0,0 +1,17 @@
+from reactive_manim import *
+
+
+def test_auto_disconnect_composes_root_once(scene):
+    tex1 = MathTex("a", "b")
+    tex2 = MathTex("c", "d")
+    scene.add(tex1, tex2)
+
+    a = tex1[0]
+    tex2[1] = a
+
+    assert tex1.tex_string == "a b"
+    assert tex2.tex_string == "c a"
+    assert tex2[1] is a
+    assert tex1[0] is not a
+
+    assert tex2.graph.manager().last_edit_composes[tex2.id] == 1
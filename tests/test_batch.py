@@ -0,0 +1,40 @@
+import pytest
+from reactive_manim import *
+
+
+def test_batch_after_remover_animation(scene):
+    tex = MathTex("a", "b", "c")
+    scene.add(tex)
+
+    # constructing a remover animation for part of the graph leaves it in ProgressToEmpty
+    FadeOut(tex[2])
+    assert isinstance(tex.graph.manager().state, ProgressToEmpty)
+
+    with tex.batch():
+        tex[0] = "x"
+        tex[1] = "y"
+
+    assert isinstance(tex.graph.manager().state, DefaultState)
+    assert tex.tex_string == "x y c"
+
+
+def test_batch_that_raises_does_not_compose(scene):
+    tex = MathTex("a", "b", "c")
+    scene.add(tex)
+
+    manager = tex.graph.manager()
+    compose_count = manager.compose_count
+
+    class EditFailed(Exception):
+        pass
+
+    error = EditFailed()
+    with pytest.raises(EditFailed) as raised:
+        with tex.batch():
+            tex[0] = "x"
+            raise error
+
+    assert raised.value is error
+    assert manager.compose_count == compose_count
+    assert isinstance(manager.state, DefaultState)
+    assert tex.tex_string == "a b c"
@@ -0,0 +1,32 @@
+import sys
+
+from manim import Dot, Mobject
+from reactive_manim import *
+
+
+def test_get_family_matches_manim_order(scene):
+    dot = Dot()
+    inner = DGroup(dot, Dot())
+    group = DGroup(inner, Dot(), DGroup(Dot()))
+
+    assert group.get_family() == Mobject.get_family(group)
+
+
+def test_deep_tree_under_default_recursion_limit(scene):
+    depth = 1000
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(1000) # CPython's default
+    try:
+        leaf = DGroup(Dot())
+        root = leaf
+        for _ in range(depth - 1):
+            root = DGroup(root)
+
+        assert leaf.identity.depth() == depth - 1
+        assert len(root.get_family()) == depth + 1
+
+        leaf.add(Dot())
+        assert len(root.get_family()) == depth + 2
+    finally:
+        sys.setrecursionlimit(limit)
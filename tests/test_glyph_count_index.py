@@ -0,0 +1,40 @@
+import math
+
+from manim import SingleStringMathTex
+from reactive_manim import *
+from reactive_manim.src import dynamic_tex_mobject
+from reactive_manim.src.dynamic_tex_mobject import GlyphCountIndex
+
+
+def test_prefetch_counts_every_leaf_from_one_render():
+    index = GlyphCountIndex()
+    index.loaded = True # start cold, without reading the on-disk index
+
+    leaves = [ "x^2", "+", r"\frac{a}{b}", "y" ]
+    index.prefetch(leaves)
+
+    for leaf in leaves:
+        assert index.lookup(leaf) == len(SingleStringMathTex(leaf))
+
+
+def test_prefetch_renders_once_per_batch(scene, monkeypatch):
+    index = GlyphCountIndex()
+    index.loaded = True
+    monkeypatch.setattr(dynamic_tex_mobject, "glyph_count_index", index)
+
+    renders = []
+    def counting_render(tex_string, *args, **kwargs):
+        renders.append(tex_string)
+        return SingleStringMathTex(tex_string, *args, **kwargs)
+    monkeypatch.setattr(dynamic_tex_mobject, "SingleStringMathTex", counting_render)
+
+    leaves = [ f"x_{{{i}}}" for i in range(70) ]
+    MathTex(*leaves)
+
+    separator = f"\\hspace{{{GlyphCountIndex.separator_em}em}}"
+    batches = [ tex_string for tex_string in renders if separator in tex_string ]
+    assert len(batches) == math.ceil(len(leaves) / GlyphCountIndex.batch_size)
+    assert not any(tex_string in leaves for tex_string in renders)
+
+    for leaf in leaves:
+        assert index.lookup(leaf) == len(SingleStringMathTex(leaf))
@@ -0,0 +1,11 @@
+from reactive_manim import *
+
+
+def test_matrix_keeps_first_entry_of_every_row(scene):
+    mat = MathMatrix([[ "x", "z" ], [ "y", "w" ]])
+
+    assert mat.tex_string == r"\begin{bmatrix} x & z \\ y & w \end{bmatrix}"
+
+    for row in mat.matrix:
+        for entry in row:
+            assert len(entry.submobjects) == 1
@@ -0,0 +1,46 @@
+import numpy as np
+from reactive_manim import *
+
+
+def test_progress_snapshot_shares_unchanged_buffers(scene):
+    tex = MathTex("a", "b")
+    scene.add(tex)
+
+    manager = tex.graph.manager()
+    first = manager.progress_manager.source_graph
+
+    # no edit since the last progress point, so the rendered points are shared
+    manager.save_source_graph()
+    second = manager.progress_manager.source_graph
+
+    assert second is not first
+    for term in tex:
+        first_term = first.find_dynamic_mobject(term.id)
+        second_term = second.find_dynamic_mobject(term.id)
+        assert second_term is not first_term
+        assert second_term.submobjects[0].points is first_term.submobjects[0].points
+
+    # the edit recomposes the root, which moves every term
+    tex[1] = "c"
+    manager.save_source_graph()
+    third = manager.progress_manager.source_graph
+
+    assert third.find_dynamic_mobject(tex[1].id).tex_string == "c"
+
+
+def test_progress_snapshot_copies_geometry_changed_without_a_compose(scene):
+    tex = MathTex("a", "b")
+    scene.add(tex)
+
+    manager = tex.graph.manager()
+    first = manager.progress_manager.source_graph
+
+    tex.rotate(PI / 2)
+    scene.scene_manager.scene_wait()
+    second = manager.progress_manager.source_graph
+
+    for term in tex:
+        first_points = first.find_dynamic_mobject(term.id).submobjects[0].points
+        second_points = second.find_dynamic_mobject(term.id).submobjects[0].points
+        assert second_points is not first_points
+        assert np.array_equal(second_points, term.submobjects[0].points)
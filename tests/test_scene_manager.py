@@ -0,0 +1,18 @@
+import pytest
+from manim import Scene
+from reactive_manim import *
+
+
+def test_several_scenes_need_an_active_scene_manager():
+    first = Scene()
+    second = Scene()
+
+    # outside of any activate(), neither scene silently captures the graph
+    with pytest.raises(Exception):
+        DGroup()
+
+    with second.scene_manager.activate():
+        assert DGroup().graph.scene_manager is second.scene_manager
+
+    with first.scene_manager.activate():
+        assert DGroup().graph.scene_manager is first.scene_manager